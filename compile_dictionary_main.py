@@ -0,0 +1,44 @@
+"""Compiles a word list into a binary lexicon for fast loading.
+
+The output can be passed anywhere a `--dict_filepath` is accepted. It is
+memory-mapped rather than parsed, so loading it takes milliseconds.
+"""
+
+import time
+
+from absl import app
+from absl import flags
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.util import constants as C
+
+
+_DICTIONARY_FILEPATH = flags.DEFINE_string(
+    "dict_filepath",
+    C.DEFAULT_DICTIONARY_FILEPATH,
+    "A path to a .txt file containing a word per line.",
+)
+
+_OUTPUT_FILEPATH = flags.DEFINE_string(
+    "output_filepath",
+    C.DEFAULT_COMPILED_DICTIONARY_FILEPATH,
+    "Where to write the compiled lexicon.",
+)
+
+
+def main(argv):
+  del argv
+  start = time.perf_counter()
+  dictionary = ScrabbleDictionary.open(_DICTIONARY_FILEPATH.value)
+  dictionary.compile(_OUTPUT_FILEPATH.value)
+  print(
+      f"Compiled {_DICTIONARY_FILEPATH.value} to {_OUTPUT_FILEPATH.value} in"
+      f" {time.perf_counter() - start:.1f}s."
+  )
+
+  start = time.perf_counter()
+  ScrabbleDictionary.open(_OUTPUT_FILEPATH.value)
+  print(f"Opening it takes {(time.perf_counter() - start) * 1e3:.1f}ms.")
+
+
+if __name__ == "__main__":
+  app.run(main)
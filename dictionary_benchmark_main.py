@@ -0,0 +1,123 @@
+"""Compares the DAWG-backed `ScrabbleDictionary` with plain nested-dict tries.
+
+Reports the memory held by each representation and the speed of the lookups
+used by the solver (word membership and letter-by-letter trie walks).
+"""
+
+import gc
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, Sequence
+
+from absl import app
+from absl import flags
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.util import constants as C
+
+
+_DICTIONARY_FILEPATH = flags.DEFINE_string(
+    "dict_filepath",
+    C.DEFAULT_DICTIONARY_FILEPATH,
+    "A path to a .txt file containing a word per line.",
+)
+
+_NUM_LOOKUPS = flags.DEFINE_integer(
+    "num_lookups", 100_000, "How many words to look up in each benchmark."
+)
+
+
+class _DictTries:
+  """The previous representation: a word set and two nested-dict tries."""
+
+  def __init__(self, words: Sequence[str]):
+    self.word_set = set(words)
+    self.prefix_tree = {}
+    self.suffix_tree = {}
+    for word in self.word_set:
+      _insert_into_dict_trie(self.prefix_tree, word)
+      _insert_into_dict_trie(self.suffix_tree, word[::-1])
+
+  def __contains__(self, word: str) -> bool:
+    return word in self.word_set
+
+
+def _insert_into_dict_trie(trie: Dict, word: str) -> None:
+  for c in word:
+    if c not in trie:
+      trie[c] = {}
+    trie = trie[c]
+  trie[ScrabbleDictionary.END_TOKEN] = {}
+
+
+def _measure_build(build: Callable[[], object]):
+  gc.collect()
+  tracemalloc.start()
+  start = time.perf_counter()
+  result = build()
+  elapsed = time.perf_counter() - start
+  size, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  return result, size, elapsed
+
+
+def _walk_all(trie: ScrabbleDictionary.Trie, words: Sequence[str]) -> int:
+  found = 0
+  for word in words:
+    node = trie
+    for c in word:
+      if c not in node:
+        break
+      node = node[c]
+    else:
+      found += ScrabbleDictionary.END_TOKEN in node
+  return found
+
+
+def _time_per_lookup(fn: Callable[[], object], n: int) -> float:
+  start = time.perf_counter()
+  fn()
+  return (time.perf_counter() - start) / n * 1e9
+
+
+def main(argv):
+  del argv
+  with open(_DICTIONARY_FILEPATH.value) as file:
+    words = [ScrabbleDictionary._sanitize_line(line) for line in file]
+  words = [word for word in words if word]
+
+  tries, tries_bytes, tries_secs = _measure_build(lambda: _DictTries(words))
+  dawg, dawg_bytes, dawg_secs = _measure_build(
+      lambda: ScrabbleDictionary(words)
+  )
+
+  rng = random.Random(0)
+  sample = [rng.choice(words) for _ in range(_NUM_LOOKUPS.value)]
+  # Half of the queries are misses that share a prefix with a real word.
+  sample = [
+      word if i % 2 else word[:-1] + "q" for i, word in enumerate(sample)
+  ]
+  n = len(sample)
+
+  print(f"{len(words)} words from {_DICTIONARY_FILEPATH.value}")
+  print(f"{'':>24}{'dict tries':>16}{'dawg':>16}")
+  print(
+      f"{'build time (s)':>24}{tries_secs:>16.2f}{dawg_secs:>16.2f}"
+  )
+  print(
+      f"{'memory (MB)':>24}{tries_bytes / 1e6:>16.1f}{dawg_bytes / 1e6:>16.1f}"
+  )
+  print(
+      f"{'word in dict (ns)':>24}"
+      f"{_time_per_lookup(lambda: [w in tries for w in sample], n):>16.0f}"
+      f"{_time_per_lookup(lambda: [w in dawg for w in sample], n):>16.0f}"
+  )
+  print(
+      f"{'prefix walk (ns/word)':>24}"
+      f"{_time_per_lookup(lambda: _walk_all(tries.prefix_tree, sample), n):>16.0f}"
+      f"{_time_per_lookup(lambda: _walk_all(dawg.prefix_tree, sample), n):>16.0f}"
+  )
+
+
+if __name__ == "__main__":
+  app.run(main)
@@ -0,0 +1,129 @@
+"""Measures the GADDAG engine's line cache over a self-play game.
+
+Two players take turns from the empty board. Before every move, both players'
+best moves are searched for, as a hint panel showing each player's options
+would. A player's rack doesn't change during the other player's turn, so the
+lines that the other player's move didn't touch can be answered from the
+cache. Each search is repeated without the cache for comparison.
+
+For each turn, reports the cache hits and misses (in lines) and the time
+taken with and without the cache.
+"""
+
+import random
+import time
+from os import path
+
+from absl import app
+from absl import flags
+from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.context.scrabble_context import ScrabbleContext
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.context.tile_pool import TilePool
+from scrabble.solver.scrabble_solver import ComputerPlayer
+from scrabble.solver.scrabble_solver import SearchResult
+from scrabble.util import constants as C
+
+
+_DICTIONARY_FILEPATH = flags.DEFINE_string(
+    "dict_filepath",
+    C.DEFAULT_COMPILED_DICTIONARY_FILEPATH
+    if path.exists(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH)
+    else C.DEFAULT_DICTIONARY_FILEPATH,
+    (
+        "A path to a .txt file containing a word per line, or to a lexicon"
+        " compiled from one by `compile_dictionary_main`."
+    ),
+)
+
+_NUM_TURNS = flags.DEFINE_integer(
+    "num_turns", 20, "How many moves to play."
+)
+
+_SEED = flags.DEFINE_integer("seed", 0, "The seed for drawing tiles.")
+
+
+def _best_score(result: SearchResult) -> int:
+  return result.best_state.total_score if result.best_state else 0
+
+
+def main(argv):
+  del argv
+  random.seed(_SEED.value)
+  dictionary = ScrabbleDictionary.open(_DICTIONARY_FILEPATH.value)
+  context = ScrabbleContext(
+      ScrabbleBoard.open(C.RESOURCE_ROOT + "/empty_board.txt"), dictionary
+  )
+  # Build the lazily computed tables up front, so that the first turn doesn't
+  # pay for them.
+  dictionary.gaddag
+  dictionary.anagram_index
+  tile_pool = TilePool(C.TILE_COUNTS)
+  players = [
+      ComputerPlayer(
+          name, tile_pool.draw(C.TILES_DRAWN_PER_PLAYER), context,
+          engine="gaddag",
+      )
+      for name in ("first", "second")
+  ]
+  uncached = ComputerPlayer(
+      "uncached", "", context, engine="gaddag", line_cache_size=0
+  )
+
+  print(
+      f"{'turn':>5}{'hits':>7}{'misses':>8}{'hit rate':>10}"
+      f"{'cached (ms)':>14}{'uncached (ms)':>16}"
+  )
+  total_hits = total_misses = 0
+  total_cached = total_uncached = 0.0
+  for turn in range(_NUM_TURNS.value):
+    hits = misses = 0
+    cached_elapsed = uncached_elapsed = 0.0
+    results = []
+    for player in players:
+      start = time.perf_counter()
+      result = player.search_next_move(context)
+      cached_elapsed += time.perf_counter() - start
+      hits += result.stats.line_cache_hits
+      misses += result.stats.line_cache_misses
+      results.append(result)
+
+      start = time.perf_counter()
+      expected = uncached.search_next_move(
+          context, rack_letters=player._rack_letters
+      )
+      uncached_elapsed += time.perf_counter() - start
+      if _best_score(result) != _best_score(expected):
+        raise AssertionError(
+            f"Turn {turn}: the cached search found {result.move}, but"
+            f" {expected.move} scores more."
+        )
+
+    print(
+        f"{turn:>5}{hits:>7}{misses:>8}{hits / max(hits + misses, 1):>10.0%}"
+        f"{cached_elapsed * 1000:>14.1f}{uncached_elapsed * 1000:>16.1f}"
+    )
+    total_hits += hits
+    total_misses += misses
+    total_cached += cached_elapsed
+    total_uncached += uncached_elapsed
+
+    player = players[turn % len(players)]
+    move = results[turn % len(players)].move
+    if move.placed_tiles:
+      context = context.execute_move(move)
+      player.play_tiles_and_draw(move, tile_pool)
+    else:
+      player._rack_letters = tile_pool.draw(C.TILES_DRAWN_PER_PLAYER)
+    if not player._rack_letters:
+      break
+
+  print(
+      f"{'total':>5}{total_hits:>7}{total_misses:>8}"
+      f"{total_hits / max(total_hits + total_misses, 1):>10.0%}"
+      f"{total_cached * 1000:>14.1f}{total_uncached * 1000:>16.1f}"
+  )
+
+
+if __name__ == "__main__":
+  app.run(main)
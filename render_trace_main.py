@@ -0,0 +1,48 @@
+"""Renders the candidate moves recorded in a search trace.
+
+Prints each candidate's board with its tiles highlighted, as
+`print_all_valid_states` does during a search, e.g. to record the "all valid
+states" animation. Traces are written by `solver_main --trace_filepath` (see
+`scrabble.solver.move_trace`).
+"""
+
+from absl import app
+from absl import flags
+from scrabble.solver.move_trace import read_trace
+
+
+_TRACE_FILEPATH = flags.DEFINE_string(
+    "trace_filepath", None, "A trace written by `solver_main`.", required=True
+)
+
+_SEARCH = flags.DEFINE_integer(
+    "search",
+    None,
+    "If set, only render the search with this index (from 0) in the trace.",
+)
+
+_MAX_MOVES = flags.DEFINE_integer(
+    "max_moves", None, "If set, render at most this many moves per search."
+)
+
+_SHOW_SCORES = flags.DEFINE_bool(
+    "show_scores", False, "Print each move and its score under its board."
+)
+
+
+def main(argv):
+  del argv
+  with open(_TRACE_FILEPATH.value) as file:
+    for i, search in enumerate(read_trace(file)):
+      if _SEARCH.value is not None and i != _SEARCH.value:
+        continue
+      for move, score in search.candidates[:_MAX_MOVES.value]:
+        print(
+            search.board.execute_move(move).printable_board(move.placed_tiles)
+        )
+        if _SHOW_SCORES.value:
+          print(f"{move}  {score}")
+
+
+if __name__ == "__main__":
+  app.run(main)
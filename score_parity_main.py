@@ -0,0 +1,58 @@
+"""Checks the solver's incremental scores against `ScrabbleContext.score_move`.
+
+A larger run of `score_parity_test`: see `scrabble.solver.score_parity`.
+"""
+
+from os import path
+
+from absl import app
+from absl import flags
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.solver import score_parity
+from scrabble.util import constants as C
+
+
+_DICTIONARY_FILEPATH = flags.DEFINE_string(
+    "dict_filepath",
+    C.DEFAULT_COMPILED_DICTIONARY_FILEPATH
+    if path.exists(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH)
+    else C.DEFAULT_DICTIONARY_FILEPATH,
+    (
+        "A path to a .txt file containing a word per line, or to a lexicon"
+        " compiled from one by `compile_dictionary_main`."
+    ),
+)
+
+_NUM_BOARDS = flags.DEFINE_integer(
+    "num_boards", 4, "How many games to generate boards from."
+)
+
+_NUM_TURNS = flags.DEFINE_integer(
+    "num_turns", 5, "How many moves to play in each game."
+)
+
+_NUM_RACKS = flags.DEFINE_integer(
+    "num_racks", 3, "How many random racks to check on each board."
+)
+
+_SEED = flags.DEFINE_integer("seed", 0, "The seed for drawing racks.")
+
+
+def main(argv):
+  del argv
+  dictionary = ScrabbleDictionary.open(_DICTIONARY_FILEPATH.value)
+  num_positions, num_checked = score_parity.check_games(
+      dictionary,
+      _NUM_BOARDS.value,
+      _NUM_TURNS.value,
+      _NUM_RACKS.value,
+      _SEED.value,
+  )
+  print(
+      f"OK: {num_checked} states on {num_positions} board/rack pairs score"
+      " the same as score_move."
+  )
+
+
+if __name__ == "__main__":
+  app.run(main)
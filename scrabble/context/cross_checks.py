@@ -0,0 +1,141 @@
+"""Cross-checks: the letters that can be played on each empty square.
+
+A tile played along a row also forms a word along the column it lands in (and
+vice versa) whenever that column has tiles adjacent to the square. The
+cross-check for a square and a move direction is the mask of letters that make
+that perpendicular word valid, along with the score of the tiles already in it.
+"""
+
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+from scrabble.context.scrabble_board import OFF_BOARD
+from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.util import constants as C
+from scrabble.util.scrabble_move import Move
+from scrabble.util.scrabble_util import ALL_LETTERS_MASK
+from scrabble.util.scrabble_util import Direction
+from scrabble.util.scrabble_util import Point
+
+_HORIZONTAL = 0
+_VERTICAL = 1
+
+
+class CrossChecks:
+  """A table of cross-checks for every square of a board, per move direction.
+
+  Occupied squares have an empty mask. Squares with no perpendicular tiles
+  allow every letter and have no cross-word score.
+  """
+
+  def __init__(
+      self,
+      board: ScrabbleBoard,
+      dictionary: ScrabbleDictionary,
+      masks: Tuple[List[int], List[int]],
+      scores: Tuple[List[Optional[int]], List[Optional[int]]],
+  ):
+    self._board = board
+    self._dictionary = dictionary
+    self._masks = masks
+    self._scores = scores
+
+  @staticmethod
+  def create(board: ScrabbleBoard, dictionary: ScrabbleDictionary) -> CrossChecks:
+    size = board.width * board.height
+    cross_checks = CrossChecks(
+        board, dictionary, ([0] * size, [0] * size), ([None] * size, [None] * size)
+    )
+    for i in range(size):
+      cross_checks._compute(i)
+    return cross_checks
+
+  def tables(self) -> Tuple[Tuple[List[int], List[int]], Tuple[List, List]]:
+    """The (masks, scores) tables, e.g. to recreate the cross-checks with
+    `CrossChecks(board, dictionary, masks, scores)` in another process."""
+    return self._masks, self._scores
+
+  def get_mask(self, point: Point, move_direction: Direction) -> int:
+    """The letters that can be played at `point` in a move along `move_direction`."""
+    return self._masks[_axis(move_direction)][self._index(point)]
+
+  def get_score(self, point: Point, move_direction: Direction) -> Optional[int]:
+    """The score of the tiles in the perpendicular word through `point`.
+
+    This is `None` if playing at `point` along `move_direction` forms no
+    perpendicular word.
+    """
+    return self._scores[_axis(move_direction)][self._index(point)]
+
+  def get_mask_at_index(self, i: int, move_direction: Direction) -> int:
+    """`get_mask` for the square with index `i` (see `SquareGrid`)."""
+    return self._masks[_axis(move_direction)][i]
+
+  def get_score_at_index(
+      self, i: int, move_direction: Direction
+  ) -> Optional[int]:
+    """`get_score` for the square with index `i` (see `SquareGrid`)."""
+    return self._scores[_axis(move_direction)][i]
+
+  def update(self, board: ScrabbleBoard, move: Move) -> CrossChecks:
+    """Return the cross-checks for `board`, the result of playing `move`.
+
+    Only the squares at either end of the runs of tiles containing the placed
+    tiles can change, so only those are recomputed.
+    """
+    cross_checks = CrossChecks(
+        board,
+        self._dictionary,
+        (self._masks[0].copy(), self._masks[1].copy()),
+        (self._scores[0].copy(), self._scores[1].copy()),
+    )
+    for tile in move.placed_tiles:
+      i = board.squares.index(tile.location)
+      cross_checks._compute(i)
+      for neighbors in board.squares.neighbors.values():
+        j = neighbors[i]
+        while j != OFF_BOARD and board.has_tile_at_index(j):
+          j = neighbors[j]
+        if j != OFF_BOARD:
+          cross_checks._compute(j)
+    return cross_checks
+
+  def _index(self, point: Point) -> int:
+    return self._board.squares.index(point)
+
+  def _compute(self, i: int) -> None:
+    if self._board.has_tile_at_index(i):
+      for axis in (_HORIZONTAL, _VERTICAL):
+        self._masks[axis][i] = 0
+        self._scores[axis][i] = None
+      return
+
+    # Moves along a row form words along the column, and vice versa.
+    for axis, reading_direction in (
+        (_HORIZONTAL, Direction.DOWN),
+        (_VERTICAL, Direction.RIGHT),
+    ):
+      prefix = self._read_tiles(i, reading_direction.inverse())[::-1]
+      suffix = self._read_tiles(i, reading_direction)
+      if prefix or suffix:
+        self._masks[axis][i] = self._dictionary.inner_hook_mask(prefix, suffix)
+        self._scores[axis][i] = sum(C.TILE_SCORES[c] for c in prefix + suffix)
+      else:
+        self._masks[axis][i] = ALL_LETTERS_MASK
+        self._scores[axis][i] = None
+
+  def _read_tiles(self, i: int, direction: Direction) -> str:
+    """The letters of the tiles after square `i` in `direction`, in order."""
+    board = self._board
+    neighbors = board.squares.neighbors[direction]
+    letters = ""
+    i = neighbors[i]
+    while i != OFF_BOARD and board.has_tile_at_index(i):
+      letters += board.letter_at_index(i)
+      i = neighbors[i]
+    return letters
+
+
+def _axis(move_direction: Direction) -> int:
+  return _HORIZONTAL if move_direction.is_horizontal() else _VERTICAL
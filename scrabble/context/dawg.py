@@ -0,0 +1,354 @@
+"""A minimized DAWG (directed acyclic word graph) stored in flat arrays.
+
+A DAWG is a trie in which identical subtrees are shared, so that common
+suffixes (e.g. "-ing", "-ed", "-s") are only stored once. Nodes are identified
+by integer ids and stored in two parallel arrays:
+
+- `_masks[node]` has bit `letter_code(c)` set for each letter c leading out of
+  the node, and `TERMINAL_BIT` set if the path to the node spells a word.
+- `_first_child[node]` is the index in `_targets` of the node's first child.
+  Children are stored contiguously in letter order, so the child for letter c
+  is found by counting the lower letters in the mask.
+- `_hooks[node]` has bit `letter_code(c)` set for each letter c that leads to a
+  terminal node, i.e. the letters that complete a word. It is derived from the
+  other two arrays, but stored so that hooks are a lookup.
+- `_extension_lengths[node]` and `_extension_letters[node]` summarize the
+  longer words below the node: the fewest letters that extend the path to
+  one, and the mask of letters that every such extension uses. A search can
+  skip the node if its remaining letters can't cover them (see `extension`).
+
+The root is always node 0. Since the letters leading out of a node form a
+bitmask, the letters allowed at a node can be intersected with a rack (see
+`letters_to_mask`) with a single AND.
+"""
+
+from __future__ import annotations
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from scrabble.util.scrabble_util import ALL_LETTERS_MASK
+from scrabble.util.scrabble_util import mask_to_letters
+from scrabble.util.scrabble_util import popcount
+
+END_TOKEN = "ø"
+ROOT = 0
+TERMINAL_BIT = 1 << 31
+# The extension length of a node that no longer word goes through.
+NO_EXTENSION = 255
+# Edges are labeled with the letters 'a'-'z' and, in a GADDAG, the character
+# after 'z' (`gaddag.SEPARATOR`). Their codes are offsets from 'a'.
+_MAX_EDGE_CODE = 26
+
+
+class Dawg:
+
+  def __init__(
+      self,
+      masks: Sequence[int],
+      first_child: Sequence[int],
+      targets: Sequence[int],
+      hooks: Sequence[int],
+      extension_lengths: Sequence[int],
+      extension_letters: Sequence[int],
+  ):
+    self._masks = masks
+    self._first_child = first_child
+    self._targets = targets
+    self._hooks = hooks
+    self._extension_lengths = extension_lengths
+    self._extension_letters = extension_letters
+
+  @staticmethod
+  def build(words: Iterable[str]) -> Dawg:
+    """Build a minimized DAWG from the given (lowercase ASCII) words."""
+    return _DawgBuilder(words).build()
+
+  def to_sections(self, name: str) -> Dict[str, array]:
+    """The arrays backing this DAWG, keyed for storage in a lexicon file."""
+    return {
+        f"{name}.masks": array("I", self._masks),
+        f"{name}.first_child": array("i", self._first_child),
+        f"{name}.targets": array("i", self._targets),
+        f"{name}.hooks": array("I", self._hooks),
+        f"{name}.extension_lengths": array("B", self._extension_lengths),
+        f"{name}.extension_letters": array("I", self._extension_letters),
+    }
+
+  @staticmethod
+  def from_sections(sections: Dict[str, memoryview], name: str) -> Dawg:
+    """Use the arrays stored by `to_sections` in place."""
+    return Dawg(
+        sections[f"{name}.masks"],
+        sections[f"{name}.first_child"],
+        sections[f"{name}.targets"],
+        sections[f"{name}.hooks"],
+        sections[f"{name}.extension_lengths"],
+        sections[f"{name}.extension_letters"],
+    )
+
+  @property
+  def num_nodes(self) -> int:
+    return len(self._masks)
+
+  @property
+  def num_edges(self) -> int:
+    return len(self._targets)
+
+  @property
+  def root(self) -> DawgNode:
+    return DawgNode(self, ROOT)
+
+  def nbytes(self) -> int:
+    """The number of bytes used by the node and edge arrays."""
+    return sum(
+        a.itemsize * len(a)
+        for a in (
+            self._masks,
+            self._first_child,
+            self._targets,
+            self._hooks,
+            self._extension_lengths,
+            self._extension_letters,
+        )
+    )
+
+  def is_terminal(self, node: int) -> bool:
+    return self._masks[node] & TERMINAL_BIT != 0
+
+  def child_mask(self, node: int) -> int:
+    """The mask of letters leading out of `node`."""
+    return self._masks[node] & ALL_LETTERS_MASK
+
+  def hook_mask(self, node: int) -> int:
+    """The mask of letters leading out of `node` to the end of a word."""
+    return self._hooks[node]
+
+  def extension(self, node: int) -> Tuple[int, int]:
+    """What it takes to extend the path to `node` into a longer word.
+
+    Returns the fewest letters to add (`NO_EXTENSION` if there is no longer
+    word), and the mask of letters that all the ways of doing so use.
+    """
+    return self._extension_lengths[node], self._extension_letters[node]
+
+  def child(self, node: int, letter: str) -> Optional[int]:
+    """Return the node reached by following `letter`, or `None`."""
+    code = ord(letter) - 97
+    if not 0 <= code <= _MAX_EDGE_CODE:
+      return None
+    mask = self._masks[node]
+    bit = 1 << code
+    if not mask & bit:
+      return None
+    return self._targets[self._first_child[node] + popcount(mask & (bit - 1))]
+
+  def children(self, node: int) -> Iterator[Tuple[str, int]]:
+    first = self._first_child[node]
+    for i, letter in enumerate(mask_to_letters(self.child_mask(node))):
+      yield letter, self._targets[first + i]
+
+  def walk(self, letters: str, node: int = ROOT) -> Optional[int]:
+    """Follow `letters` from `node`, returning `None` if the path ends."""
+    # Inlined `child` since this is used for every dictionary lookup.
+    masks = self._masks
+    first_child = self._first_child
+    targets = self._targets
+    for code in letters.encode():
+      code -= 97
+      # Not a letter, e.g. an apostrophe or a digit.
+      if not 0 <= code <= _MAX_EDGE_CODE:
+        return None
+      mask = masks[node]
+      bit = 1 << code
+      if not mask & bit:
+        return None
+      node = targets[first_child[node] + popcount(mask & (bit - 1))]
+    return node
+
+  def __contains__(self, word: str) -> bool:
+    node = self.walk(word)
+    return node is not None and self._masks[node] & TERMINAL_BIT != 0
+
+
+class DawgNode(Mapping):
+  """A read-only `ScrabbleDictionary.Trie` view of a single DAWG node.
+
+  Keys are the letters leading out of the node, plus `END_TOKEN` if the node
+  ends a word. Looking up a letter returns the `DawgNode` it leads to.
+  """
+
+  __slots__ = ("_dawg", "node")
+
+  def __init__(self, dawg: Dawg, node: int):
+    self._dawg = dawg
+    self.node = node
+
+  @property
+  def is_terminal(self) -> bool:
+    return self._dawg.is_terminal(self.node)
+
+  @property
+  def child_mask(self) -> int:
+    return self._dawg.child_mask(self.node)
+
+  @property
+  def hook_mask(self) -> int:
+    return self._dawg.hook_mask(self.node)
+
+  @property
+  def extension(self) -> Tuple[int, int]:
+    return self._dawg.extension(self.node)
+
+  def __contains__(self, key: object) -> bool:
+    if key == END_TOKEN:
+      return self.is_terminal
+    try:
+      return self._dawg._masks[self.node] & (1 << (ord(key) - 97)) != 0
+    except (TypeError, ValueError):  # Not a single letter.
+      return False
+
+  def __getitem__(self, key: str) -> Mapping:
+    if key == END_TOKEN:
+      if self.is_terminal:
+        return {}
+    elif key in self:
+      return DawgNode(self._dawg, self._dawg.child(self.node, key))
+    raise KeyError(key)
+
+  def __iter__(self) -> Iterator[str]:
+    yield from mask_to_letters(self.child_mask)
+    if self.is_terminal:
+      yield END_TOKEN
+
+  def __len__(self) -> int:
+    return popcount(self._dawg._masks[self.node])
+
+  def __eq__(self, other: object) -> bool:
+    if isinstance(other, DawgNode):
+      return self._dawg is other._dawg and self.node == other.node
+    return Mapping.__eq__(self, other)
+
+  def __hash__(self) -> int:
+    return hash((id(self._dawg), self.node))
+
+  def __repr__(self) -> str:
+    return f"DawgNode({self.node}, keys={list(self)})"
+
+
+class _BuilderNode:
+  __slots__ = ("terminal", "edges", "id")
+
+  def __init__(self):
+    self.terminal = False
+    self.edges: Dict[str, _BuilderNode] = {}
+    self.id = -1
+
+  def signature(self) -> Tuple:
+    return (self.terminal, tuple((c, n.id) for c, n in self.edges.items()))
+
+
+class _DawgBuilder:
+  """Incremental construction of a minimal DAWG from sorted input.
+
+  See Daciuk et al., "Incremental Construction of Minimal Acyclic Finite-State
+  Automata" (2000). Once a word has been inserted, every node that is not on
+  the path shared with the next word is final and can be merged with an
+  equivalent node in the register.
+  """
+
+  def __init__(self, words: Iterable[str]):
+    # Empty strings are not words and would make the root terminal.
+    self._words = sorted(set(word for word in words if word))
+    self._root = _BuilderNode()
+    self._register: Dict[Tuple, _BuilderNode] = {}
+    self._unchecked: List[Tuple[_BuilderNode, str, _BuilderNode]] = []
+
+  def build(self) -> Dawg:
+    previous = ""
+    for word in self._words:
+      common = 0
+      for a, b in zip(word, previous):
+        if a != b:
+          break
+        common += 1
+      self._minimize(common)
+
+      node = self._unchecked[-1][2] if self._unchecked else self._root
+      for letter in word[common:]:
+        child = _BuilderNode()
+        node.edges[letter] = child
+        self._unchecked.append((node, letter, child))
+        node = child
+      node.terminal = True
+      previous = word
+
+    self._minimize(0)
+    return self._flatten()
+
+  def _minimize(self, down_to: int) -> None:
+    while len(self._unchecked) > down_to:
+      parent, letter, child = self._unchecked.pop()
+      signature = child.signature()
+      existing = self._register.get(signature)
+      if existing is not None:
+        parent.edges[letter] = existing
+      else:
+        child.id = len(self._register)
+        self._register[signature] = child
+
+  def _flatten(self) -> Dawg:
+    # Renumber in breadth-first order so that the root is node 0.
+    order = [self._root]
+    ids = {id(self._root): ROOT}
+    for node in order:
+      for child in node.edges.values():
+        if id(child) not in ids:
+          ids[id(child)] = len(order)
+          order.append(child)
+
+    extension_lengths, extension_letters = self._extensions()
+    masks = array("I")
+    first_child = array("i")
+    targets = array("i")
+    hooks = array("I")
+    for node in order:
+      mask = TERMINAL_BIT if node.terminal else 0
+      hook_mask = 0
+      first_child.append(len(targets))
+      for letter, child in sorted(node.edges.items()):
+        bit = 1 << (ord(letter) - 97)
+        mask |= bit
+        if child.terminal:
+          hook_mask |= bit
+        targets.append(ids[id(child)])
+      masks.append(mask)
+      hooks.append(hook_mask & ALL_LETTERS_MASK)
+
+    return Dawg(
+        masks,
+        first_child,
+        targets,
+        hooks,
+        array("B", (extension_lengths[id(node)] for node in order)),
+        array("I", (extension_letters[id(node)] for node in order)),
+    )
+
+  def _extensions(self) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """The extension length and letters of each node, by `id`."""
+    lengths: Dict[int, int] = {}
+    letters: Dict[int, int] = {}
+    # Nodes are registered after their children, so those are already done.
+    for node in (*self._register.values(), self._root):
+      length = NO_EXTENSION
+      required = ~0
+      for letter, child in node.edges.items():
+        if child.terminal:
+          child_length, child_required = 0, 0
+        else:
+          child_length, child_required = lengths[id(child)], letters[id(child)]
+        length = min(length, child_length + 1)
+        required &= (1 << (ord(letter) - 97)) | child_required
+      lengths[id(node)] = length
+      letters[id(node)] = required & 0xFFFFFFFF
+    return lengths, letters
@@ -0,0 +1,34 @@
+"""A GADDAG: a DAWG of every word, split at each letter and read both ways.
+
+See Gordon, "A Faster Scrabble Move Generation Algorithm" (1994). For each way
+of splitting a word w into a non-empty head and a tail, the GADDAG contains
+
+    reverse(head) + SEPARATOR + tail
+
+except that the entry for an empty tail is just `reverse(w)`. Starting from
+any letter of a word, a move generator can then walk backwards to the start of
+the word, cross the `SEPARATOR` and walk forwards to its end, following a
+single path through the graph.
+
+The GADDAG is stored as a `Dawg`, with `SEPARATOR` as a 27th letter. Its bit
+is outside of `ALL_LETTERS_MASK`, so `Dawg.child_mask` only reports letters and
+the separator is followed with `Dawg.child`.
+"""
+
+from typing import Iterable, Iterator
+
+from scrabble.context.dawg import Dawg
+
+SEPARATOR = "{"  # The character after 'z'.
+
+
+def build(words: Iterable[str]) -> Dawg:
+  """Build the GADDAG of the given (lowercase ASCII) words."""
+  return Dawg.build(_entries(words))
+
+
+def _entries(words: Iterable[str]) -> Iterator[str]:
+  for word in words:
+    yield word[::-1]
+    for i in range(1, len(word)):
+      yield word[i - 1::-1] + SEPARATOR + word[i:]
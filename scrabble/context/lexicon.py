@@ -0,0 +1,101 @@
+"""A versioned binary file format for compiled dictionaries.
+
+A lexicon file is a header followed by a number of named, 8-byte aligned
+sections, each holding a flat array:
+
+  magic        8 bytes   b"SCRBLEX\\0"
+  version      uint32    `VERSION`
+  byte order   uint32    `_BYTE_ORDER_MARK`, in the compiling machine's order
+  num sections uint32
+  section table          num_sections x (name: 32s, typecode: 1s, offset: uint64,
+                         length: uint64)
+  section data
+
+Arrays are stored in native byte order so that they can be used in place as
+`memoryview`s of a read-only `mmap`, without deserializing them. Since the
+pages are backed by the file, they are shared between all processes that open
+the same lexicon.
+"""
+
+from __future__ import annotations
+from array import array
+import mmap
+import struct
+from typing import Dict, Union
+
+MAGIC = b"SCRBLEX\0"
+VERSION = 4
+
+_BYTE_ORDER_MARK = 0x01020304
+_HEADER = struct.Struct("=8sIII")
+_SECTION = struct.Struct("=32s1sQQ")
+_ALIGNMENT = 8
+
+Section = Union[array, bytes, bytearray, memoryview]
+
+
+class LexiconFormatError(ValueError):
+  pass
+
+
+def is_lexicon(fname: str) -> bool:
+  with open(fname, "rb") as file:
+    return file.read(len(MAGIC)) == MAGIC
+
+
+def write(fname: str, sections: Dict[str, Section]) -> None:
+  """Write the given named arrays to `fname`. Bytes are stored as "B" arrays."""
+  table_end = _HEADER.size + _SECTION.size * len(sections)
+  offset = _align(table_end)
+  entries = []
+  for name, data in sections.items():
+    if not isinstance(data, array):
+      data = array("B", bytes(data))
+    entries.append((name, data, offset))
+    offset = _align(offset + data.itemsize * len(data))
+
+  with open(fname, "wb") as file:
+    file.write(_HEADER.pack(MAGIC, VERSION, _BYTE_ORDER_MARK, len(sections)))
+    for name, data, offset in entries:
+      file.write(
+          _SECTION.pack(name.encode(), data.typecode.encode(), offset, len(data))
+      )
+    for name, data, offset in entries:
+      file.write(b"\0" * (offset - file.tell()))
+      data.tofile(file)
+
+
+def open_mmap(fname: str) -> Dict[str, memoryview]:
+  """Map `fname` into memory and return a typed view of each section."""
+  with open(fname, "rb") as file:
+    buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+  magic, version, byte_order, num_sections = _HEADER.unpack_from(buffer, 0)
+  if magic != MAGIC:
+    raise LexiconFormatError(f"{fname} is not a compiled lexicon.")
+  if version != VERSION:
+    raise LexiconFormatError(
+        f"{fname} has format version {version}, but version {VERSION} is"
+        " required. Recompile it with `compile_dictionary_main`."
+    )
+  if byte_order != _BYTE_ORDER_MARK:
+    raise LexiconFormatError(
+        f"{fname} was compiled on a machine with a different byte order."
+    )
+
+  view = memoryview(buffer)
+  sections = {}
+  for i in range(num_sections):
+    name, typecode, offset, length = _SECTION.unpack_from(
+        buffer, _HEADER.size + i * _SECTION.size
+    )
+    typecode = typecode.decode()
+    itemsize = array(typecode).itemsize
+    sections[name.rstrip(b"\0").decode()] = view[
+        offset : offset + itemsize * length
+    ].cast(typecode)
+  return sections
+
+
+def _align(offset: int) -> int:
+  return -(-offset // _ALIGNMENT) * _ALIGNMENT
@@ -1,6 +1,8 @@
 from __future__ import annotations
-import copy
-from typing import List, Optional, Iterator, Sequence
+import functools
+from typing import Dict, List, Optional, Iterator, Sequence, Tuple
+
+import numpy as np
 
 from scrabble.util import constants as C
 from scrabble.util.constants import Style
@@ -9,29 +11,158 @@ from scrabble.util.scrabble_util import Direction
 from scrabble.util.scrabble_util import PlacedTile
 from scrabble.util.scrabble_util import Point
 
+EMPTY = 0
+"""The letter code of an empty square. Letters 'a'-'z' have codes 1-26."""
+
+OFF_BOARD = -1
+"""The square index of the neighbor of an edge square, past the edge."""
+
+# Square marker -> (letter multiplier, word multiplier).
+_PREMIUMS = {
+    C.DOUBLE_LETTER_SCORE: (2, 1),
+    C.TRIPLE_LETTER_SCORE: (3, 1),
+    C.DOUBLE_WORD_SCORE: (1, 2),
+    C.TRIPLE_WORD_SCORE: (1, 3),
+}
+_PREMIUM_NAMES = {multipliers: name for name, multipliers in _PREMIUMS.items()}
+
+
+class SquareGrid:
+  """Flat indices for the squares of a board, and the neighbors of each one.
+
+  Square (x, y) has index `x * height + y`, i.e. squares are numbered in the
+  order that boards iterate over their points. Solver internals work with
+  indices: stepping to a neighbor is a list lookup, and `points` turns an
+  index back into a `Point` without allocating one.
+  """
+
+  def __init__(self, width: int, height: int):
+    self.width = width
+    self.height = height
+    self.points = [Point(x, y) for x in range(width) for y in range(height)]
+    # Direction -> the index of the next square that way from each square, or
+    # `OFF_BOARD`.
+    self.neighbors: Dict[Direction, List[int]] = {}
+    for direction in Direction:
+      dx, dy = direction.delta
+      self.neighbors[direction] = [
+          self._index_if_on_board(point.x + dx, point.y + dy)
+          for point in self.points
+      ]
+    # The indices of the squares next to each square.
+    self.adjacent: List[Tuple[int, ...]] = [
+        tuple(
+            neighbors[i]
+            for neighbors in self.neighbors.values()
+            if neighbors[i] != OFF_BOARD
+        )
+        for i in range(len(self.points))
+    ]
+
+  @staticmethod
+  @functools.lru_cache(maxsize=None)
+  def of_size(width: int, height: int) -> SquareGrid:
+    """The grid for boards of this size, shared by all of them."""
+    return SquareGrid(width, height)
+
+  def index(self, point: Point) -> int:
+    """The index of `point`, which must be on the board."""
+    return point.x * self.height + point.y
+
+  def line(self, move_direction: Direction, index: int) -> List[int]:
+    """The indices of the squares of a line, as in `ScrabbleBoard.get_line`."""
+    if move_direction.is_horizontal():
+      return [x * self.height + index for x in range(self.width)]
+    return [index * self.height + y for y in range(self.height)]
+
+  def _index_if_on_board(self, x: int, y: int) -> int:
+    if 0 <= x < self.width and 0 <= y < self.height:
+      return x * self.height + y
+    return OFF_BOARD
+
 
 class ScrabbleBoard:
+  """A Scrabble board, stored as `uint8` planes indexed by `[x, y]`.
+
+  - `_letters` holds the letter code of the tile on each square (or `EMPTY`).
+  - `_letter_multipliers` and `_word_multipliers` hold the premiums of each
+    square. They are read-only and shared by all boards derived from this one;
+    the premium of a square only counts while the square is empty.
+
+  The same data is also kept in lists indexed by square (see `SquareGrid`),
+  which are much faster to read one square at a time.
+  """
 
   def __init__(self, array: List[List[str]]):
-    self._array = array
-    self.width = len(array[0])
-    self.height = len(array)
+    letters = np.zeros((len(array), len(array[0])), dtype=np.uint8)
+    letter_multipliers = np.ones_like(letters)
+    word_multipliers = np.ones_like(letters)
+    for x, row in enumerate(array):
+      for y, square in enumerate(row):
+        if square in _PREMIUMS:
+          letter_multipliers[x, y], word_multipliers[x, y] = _PREMIUMS[square]
+        elif square.isalpha():
+          letters[x, y] = _letter_to_code(square)
+    letter_multipliers.setflags(write=False)
+    word_multipliers.setflags(write=False)
+    self._init(letters, letter_multipliers, word_multipliers)
+
+  def _init(
+      self,
+      letters: np.ndarray,
+      letter_multipliers: np.ndarray,
+      word_multipliers: np.ndarray,
+  ) -> None:
+    self._letters = letters
+    self._letter_multipliers = letter_multipliers
+    self._word_multipliers = word_multipliers
+    self.width = letters.shape[1]
+    self.height = letters.shape[0]
     self._start_point = Point(self.width // 2, self.height // 2)
+    self.squares = SquareGrid.of_size(self.width, self.height)
+    self._start_index = self.squares.index(self._start_point)
+    self._square_letters = self._by_square(letters)
+    self._square_multipliers = list(
+        zip(
+            self._by_square(letter_multipliers),
+            self._by_square(word_multipliers),
+        )
+    )
+
+  def _by_square(self, plane: np.ndarray) -> List[int]:
+    return [plane.item(point.x, point.y) for point in self.squares.points]
+
+  @staticmethod
+  def _from_planes(
+      letters: np.ndarray,
+      letter_multipliers: np.ndarray,
+      word_multipliers: np.ndarray,
+  ) -> ScrabbleBoard:
+    board = ScrabbleBoard.__new__(ScrabbleBoard)
+    board._init(letters, letter_multipliers, word_multipliers)
+    return board
+
+  @property
+  def start_point(self) -> Point:
+    """The square that the first move must cover."""
+    return self._start_point
 
   def __getitem__(self, point: Point) -> str:
     if point not in self:
       raise IndexError(
           f"{point} is not in the board. WxH = {self.width}x{self.height}"
       )
-    return self._array[point.x][point.y]
+    i = self.squares.index(point)
+    code = self._square_letters[i]
+    if code != EMPTY:
+      return _code_to_letter(code)
+    return _PREMIUM_NAMES.get(self._square_multipliers[i], C.EMPTY_SQUARE)
 
   def __contains__(self, point: Point) -> bool:
-    return point.x in range(self.width) and point.y in range(self.height)
+    return 0 <= point.x < self.width and 0 <= point.y < self.height
 
   def __iter__(self) -> Iterator[Point]:
-    for x in range(self.width):
-      for y in range(self.height):
-        yield Point(x, y)
+    return iter(self.squares.points)
 
   def printable_board(self, highlighted_tiles: Optional[Sequence[PlacedTile]]=None) -> str:
     highlighted_tiles = set(tile.location for tile in highlighted_tiles) if highlighted_tiles else set()
@@ -65,14 +196,48 @@ class ScrabbleBoard:
     return point in self and not self.has_tile_at(point)
 
   def has_tile_at(self, point: Point) -> bool:
-    return point in self and (self[point].isalpha() or self[point] == " ")
+    return (
+        point in self
+        and self._square_letters[self.squares.index(point)] != EMPTY
+    )
 
   def point_touches_tiles(self, point: Point) -> bool:
     # TODO: rename.
-    return point == self._start_point or any(
+    if point in self:
+      return self.touches_tiles_at_index(self.squares.index(point))
+    return any(
         self.has_tile_at(point.move(direction)) for direction in Direction
     )
 
+  def is_empty(self) -> bool:
+    """Whether no tiles have been played, i.e. the next move is the first."""
+    return not any(self._square_letters)
+
+  def get_multipliers(self, point: Point) -> Tuple[int, int]:
+    """The (letter, word) multipliers that a tile placed at `point` scores with."""
+    return self.multipliers_at_index(self.squares.index(point))
+
+  # The methods below take square indices (see `SquareGrid`) instead of points.
+
+  def has_tile_at_index(self, i: int) -> bool:
+    return self._square_letters[i] != EMPTY
+
+  def letter_at_index(self, i: int) -> str:
+    """The letter of the tile on square `i`, which must have one."""
+    return _code_to_letter(self._square_letters[i])
+
+  def touches_tiles_at_index(self, i: int) -> bool:
+    """Whether a tile on square `i` would connect to the tiles on the board."""
+    letters = self._square_letters
+    return i == self._start_index or any(
+        letters[j] != EMPTY for j in self.squares.adjacent[i]
+    )
+
+  def multipliers_at_index(self, i: int) -> Tuple[int, int]:
+    if self._square_letters[i] != EMPTY:
+      return 1, 1
+    return self._square_multipliers[i]
+
   def score_single_word(self, tiles: List[PlacedTile]) -> int:
     """Calculate the score of a single "word" (tile sequence) when played on this board.
 
@@ -83,32 +248,94 @@ class ScrabbleBoard:
     raw_score = 0
     word_multiplier = 1
     for tile in tiles:
-      board_tile = self[tile.location]
-      letter_score = C.TILE_SCORES[tile.letter]
-      if board_tile == C.DOUBLE_LETTER_SCORE:
-        letter_score *= 2
-      elif board_tile == C.TRIPLE_LETTER_SCORE:
-        letter_score *= 3
-      elif board_tile == C.DOUBLE_WORD_SCORE:
-        word_multiplier *= 2
-      elif board_tile == C.TRIPLE_WORD_SCORE:
-        word_multiplier *= 3
-
-      raw_score += letter_score
+      letter_multiplier, square_word_multiplier = self.get_multipliers(
+          tile.location
+      )
+      raw_score += C.TILE_SCORES[tile.letter] * letter_multiplier
+      word_multiplier *= square_word_multiplier
 
     return raw_score * word_multiplier
 
   def execute_move(self, move: Move) -> ScrabbleBoard:
-    new_array = copy.deepcopy(self._array)
+    """Return the board after playing `move`, as an overlay on this board.
+
+    The overlay shares this board's squares, so this is cheap enough to call
+    for every candidate move. Use `materialize` to flatten it.
+    """
+    placed = {}
     for tile in move.placed_tiles:
       if not self.can_place_tile_at(tile.location):
         raise RuntimeError(
             f"Cannot place tile '{tile.letter}' at {tile.location} as"
             f" '{self[tile.location]}' is already present."
         )
-      new_array[tile.location.x][tile.location.y] = tile.letter
+      placed[tile.location] = tile.letter
+
+    return BoardOverlay(self, placed)
+
+  def materialize(self) -> ScrabbleBoard:
+    """Return a standalone board with the same tiles as this one."""
+    return self
+
+  def occupied(self) -> np.ndarray:
+    """A boolean array indexed by `[x, y]`: whether a square has a tile."""
+    return self._letters != EMPTY
 
-    return ScrabbleBoard(new_array)
+  def neighbor_mask(self) -> np.ndarray:
+    """A boolean array of the empty squares next to at least one tile."""
+    occupied = self.occupied()
+    neighbors = np.zeros_like(occupied)
+    neighbors[1:, :] |= occupied[:-1, :]
+    neighbors[:-1, :] |= occupied[1:, :]
+    neighbors[:, 1:] |= occupied[:, :-1]
+    neighbors[:, :-1] |= occupied[:, 1:]
+    return neighbors & ~occupied
+
+  def anchor_mask(self) -> np.ndarray:
+    """A boolean array of the squares that a move must cover one of.
+
+    These are the empty squares next to tiles, or the start square if the board
+    is empty.
+    """
+    anchors = self.neighbor_mask()
+    if not anchors.any() and not self.has_tile_at(self._start_point):
+      anchors[self._start_point.x, self._start_point.y] = True
+    return anchors
+
+  def anchor_indices(self) -> List[int]:
+    """The indices (see `SquareGrid`) of the squares in `anchor_mask`."""
+    anchors = self.anchor_mask()
+    return [
+        i
+        for i, point in enumerate(self.squares.points)
+        if anchors.item(point.x, point.y)
+    ]
+
+  def get_line(
+      self, move_direction: Direction, index: int
+  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read-only views of the line of squares that a move can be played along.
+
+    Returns the letter codes, letter multipliers and word multipliers of the
+    line, in the order of `move_direction` (which must be RIGHT or DOWN).
+    Horizontal lines are indexed by `y` and vertical ones by `x`.
+    """
+    if move_direction.is_horizontal():
+      key = (slice(None), index)
+    else:
+      key = (index, slice(None))
+    letters = self.occupied_letters()[key]
+    return (
+        letters,
+        self._letter_multipliers[key],
+        self._word_multipliers[key],
+    )
+
+  def occupied_letters(self) -> np.ndarray:
+    """A read-only view of the letter codes of all squares."""
+    letters = self._letters.view()
+    letters.setflags(write=False)
+    return letters
 
   def get_horizontal_word_at(self, start: Point) -> Optional[List[PlacedTile]]:
     return self._get_word_in_direction(start, Direction.RIGHT)
@@ -117,28 +344,26 @@ class ScrabbleBoard:
     return self._get_word_in_direction(start, Direction.DOWN)
 
   def _get_word_in_direction(self, start: Point, reading_direction: Direction):
-    forward = reading_direction
-    backward = forward.inverse()
-    word_start: Point = start
-    word_end = word_start.move(forward)
-
-    while self.has_tile_at(word_start.move(backward)):
-      word_start = word_start.move(backward)
-
-    while self.has_tile_at(word_end):
-      word_end = word_end.move(forward)
-
-    if word_end.distance(word_start) <= 1:
-      return None
+    forward = self.squares.neighbors[reading_direction]
+    backward = self.squares.neighbors[reading_direction.inverse()]
+    letters = self._square_letters
+    start_index = word_start = self.squares.index(start)
+    while (
+        backward[word_start] != OFF_BOARD
+        and letters[backward[word_start]] != EMPTY
+    ):
+      word_start = backward[word_start]
 
     # Get all tiles from start to end.
     result = []
-    pt = word_start
-    while pt != word_end:
-      tile = PlacedTile(self[pt], pt)
-      result.append(tile)
-      pt = pt.move(forward)
+    i = word_start
+    while i != OFF_BOARD and (letters[i] != EMPTY or i == start_index):
+      point = self.squares.points[i]
+      result.append(PlacedTile(self[point], point))
+      i = forward[i]
 
+    if len(result) <= 1:
+      return None
     return result
 
   @staticmethod
@@ -157,6 +382,85 @@ class ScrabbleBoard:
 
       return ScrabbleBoard(transpose)
 
+class BoardOverlay(ScrabbleBoard):
+  """A board with tiles placed on top of another board, without copying it."""
+
+  def __init__(self, base: ScrabbleBoard, placed: Dict[Point, str]):
+    self._base = base
+    self._placed = placed
+    self._letter_multipliers = base._letter_multipliers
+    self._word_multipliers = base._word_multipliers
+    self.width = base.width
+    self.height = base.height
+    self._start_point = base._start_point
+    self.squares = base.squares
+    self._start_index = base._start_index
+    self._square_letters = _OverlaidLetters(
+        base._square_letters,
+        {
+            self.squares.index(point): _letter_to_code(letter)
+            for point, letter in placed.items()
+        },
+    )
+    self._square_multipliers = base._square_multipliers
+
+  @property
+  def _letters(self) -> np.ndarray:
+    # Only needed by the whole-board helpers, e.g. `occupied`.
+    return self.materialize()._letters
+
+  def is_empty(self) -> bool:
+    return not self._placed and self._base.is_empty()
+
+  def execute_move(self, move: Move) -> ScrabbleBoard:
+    overlay = self._base.execute_move(move)
+    for location in overlay._placed:
+      if location in self._placed:
+        raise RuntimeError(
+            f"Cannot place tile '{overlay._placed[location]}' at {location} as"
+            f" '{self._placed[location]}' is already present."
+        )
+    return BoardOverlay(self._base, {**self._placed, **overlay._placed})
+
+  def materialize(self) -> ScrabbleBoard:
+    letters = self._base._letters.copy()
+    for point, letter in self._placed.items():
+      letters[point.x, point.y] = _letter_to_code(letter)
+    return ScrabbleBoard._from_planes(
+        letters, self._letter_multipliers, self._word_multipliers
+    )
+
+
+class _OverlaidLetters:
+  """The letter codes of a `BoardOverlay` by square.
+
+  Reads the codes of the placed tiles, then those of the base board, so that
+  the base board's list doesn't need to be copied.
+  """
+
+  __slots__ = ("_base", "_placed")
+
+  def __init__(self, base: List[int], placed: Dict[int, int]):
+    self._base = base
+    self._placed = placed
+
+  def __getitem__(self, i: int) -> int:
+    code = self._placed.get(i)
+    return self._base[i] if code is None else code
+
+  def __iter__(self) -> Iterator[int]:
+    placed = self._placed
+    return (placed.get(i, code) for i, code in enumerate(self._base))
+
+
+def _letter_to_code(letter: str) -> int:
+  return ord(letter) - 96
+
+
+def _code_to_letter(code: int) -> str:
+  return chr(code + 96)
+
+
 def _transpose_array(a):
   transpose = [[None] * len(a) for _ in a[0]]
   for i in range(len(a)):
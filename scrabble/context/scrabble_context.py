@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Sequence, Optional
+from typing import Any, Dict, FrozenSet, List, Sequence, Optional
 
 from scrabble.util import constants as C
 from scrabble.util.scrabble_move import Move
 from scrabble.util.scrabble_move import MoveType
 from scrabble.util.scrabble_util import PlacedTile
+from scrabble.context.cross_checks import CrossChecks
 from scrabble.context.scrabble_board import ScrabbleBoard
 from scrabble.context.tile_pool import TilePool
 from scrabble.context.scrabble_dictionary import ScrabbleDictionary
@@ -17,14 +18,66 @@ class ScrabbleContext(object):
   def __init__(
       self,
       board: ScrabbleBoard,
-      dictionary: ScrabbleDictionary
+      dictionary: ScrabbleDictionary,
+      cross_checks: Optional[CrossChecks] = None,
+      anchors: Optional[FrozenSet[int]] = None,
   ):
     self.board = board
     self.dictionary = dictionary
     self.solver_constraint_map = {}
+    self._cross_checks = cross_checks
+    self._anchors = anchors
+
+  @property
+  def cross_checks(self) -> CrossChecks:
+    """The cross-checks for every square of the board, computed on first use."""
+    if self._cross_checks is None:
+      self._cross_checks = CrossChecks.create(self.board, self.dictionary)
+    return self._cross_checks
+
+  @property
+  def anchors(self) -> FrozenSet[int]:
+    """The squares that a move must cover one of, by index (see `SquareGrid`).
+
+    These are the empty squares next to tiles, or the start square if the board
+    is empty. They are found on first use and then kept up to date by
+    `execute_move`.
+    """
+    if self._anchors is None:
+      self._anchors = frozenset(self.board.anchor_indices())
+    return self._anchors
 
   def execute_move(self, move: Move) -> ScrabbleContext:
-    return ScrabbleContext(self.board.execute_move(move), self.dictionary)
+    # The context outlives the search, so don't keep stacking overlays.
+    board = self.board.execute_move(move).materialize()
+    cross_checks = None
+    if self._cross_checks is not None:
+      # Only recompute the squares affected by the move.
+      cross_checks = self._cross_checks.update(board, move)
+    anchors = self._anchors
+    if anchors is not None and move.placed_tiles:
+      anchors = self._update_anchors(board, move)
+    return ScrabbleContext(board, self.dictionary, cross_checks, anchors)
+
+  def _update_anchors(self, board: ScrabbleBoard, move: Move) -> FrozenSet[int]:
+    """The anchors of `board`, the result of playing `move`.
+
+    Tiles are never removed, so the only changes are that the placed tiles
+    cover their squares, the empty squares next to them become anchors, and
+    the start square stops being one just for being the start.
+    """
+    squares = board.squares
+    anchors = set(self._anchors)
+    start = squares.index(board.start_point)
+    if not any(board.has_tile_at_index(j) for j in squares.adjacent[start]):
+      anchors.discard(start)
+    for tile in move.placed_tiles:
+      i = squares.index(tile.location)
+      anchors.discard(i)
+      for j in squares.adjacent[i]:
+        if not board.has_tile_at_index(j):
+          anchors.add(j)
+    return frozenset(anchors)
 
   def score_move(self, move: Move, check_valid=False) -> Dict[str, Any]:
     """Calculate the score for the given move."""
@@ -1,55 +1,238 @@
 from __future__ import annotations
-from typing import Dict, Sequence
+from collections import Counter
+from collections import OrderedDict
+import itertools
+from typing import (
+    Container,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from scrabble.context import dawg
+from scrabble.context import gaddag
+from scrabble.context import lexicon
+from scrabble.context.dawg import Dawg
+from scrabble.util import constants as C
+from scrabble.util.scrabble_util import letter_bit
 
 
 class ScrabbleDictionary(object):
-  END_TOKEN = "ø"
-  Trie: Dict[str, Dict] = {}
+  END_TOKEN = dawg.END_TOKEN
+  Trie = Mapping[str, "ScrabbleDictionary.Trie"]
   """
-    A valid `Trie` is a dictionary (mapping `str -> Trie`) with the following properties:
+    A valid `Trie` is a read-only mapping (`str -> Trie`) with the following properties:
     - Each key is either a lowercase alphanumeric character or the `END_TOKEN` (`ø`).
-    - Leaf nodes (end of word) are represented as a mapping from `ø` to an empty `dict`. No other key may map to an empty `dict`.
-    - A Trie cannot be recursively constructed.
+    - The `END_TOKEN` is present exactly when the path to the node spells a word.
+    - Subtries may be shared between different paths (the tries are DAWGs).
     """
 
   def __init__(self, word_list: Sequence[str]):
-    self._word_set = set(word.lower() for word in word_list)
-    self.suffix_tree = ScrabbleDictionary._build_suffix_tree(self._word_set)
-    self.prefix_tree = ScrabbleDictionary._build_prefix_tree(self._word_set)
+    word_set = set(word.lower() for word in word_list)
+    self._init(
+        word_set,
+        Dawg.build(word_set),
+        Dawg.build(word[::-1] for word in word_set),
+        gaddag=None,
+        sorted_words=None,
+    )
+
+  def _init(
+      self,
+      words: Container[str],
+      prefix_dawg: Dawg,
+      suffix_dawg: Dawg,
+      gaddag: Optional[Dawg],
+      sorted_words: Optional[memoryview],
+  ) -> None:
+    self._words = words
+    self._sorted_words = sorted_words
+    self._prefix_dawg = prefix_dawg
+    self._suffix_dawg = suffix_dawg
+    self._gaddag = gaddag
+    # The compiled lexicon that this dictionary was opened from, if any.
+    self._fname: Optional[str] = None
+    self.prefix_tree: ScrabbleDictionary.Trie = self._prefix_dawg.root
+    self.suffix_tree: ScrabbleDictionary.Trie = self._suffix_dawg.root
+    # (prefix, suffix) -> `inner_hook_mask(prefix, suffix)`, least recently
+    # used first.
+    self._inner_hooks: OrderedDict[Tuple[str, str], int] = OrderedDict()
+    # Sorted letters -> the words made of exactly those letters. See
+    # `anagrams`.
+    self._anagram_index: Optional[Dict[str, List[str]]] = None
+
+  def __reduce__(self):
+    # Compiled lexicons are mapped into memory, which can't be pickled. Other
+    # processes can map the same file instead (and share its pages).
+    if self._fname is not None:
+      return ScrabbleDictionary.open, (self._fname,)
+    return super().__reduce__()
+
+  @property
+  def gaddag(self) -> Dawg:
+    """The GADDAG of all words (see `scrabble.context.gaddag`).
+
+    Compiled lexicons store it; otherwise it is built on first use, which takes
+    much longer than building the tries.
+    """
+    if self._gaddag is None:
+      self._gaddag = gaddag.build(self)
+    return self._gaddag
+
+  @property
+  def anagram_index(self) -> Mapping[str, List[str]]:
+    """The words by their letters in alphabetical order, built on first use."""
+    if self._anagram_index is None:
+      index: Dict[str, List[str]] = {}
+      for word in self:
+        index.setdefault("".join(sorted(word)), []).append(word)
+      self._anagram_index = index
+    return self._anagram_index
+
+  def anagrams(self, letters: Sequence[str]) -> List[str]:
+    """The words that use exactly `letters`, in any order.
+
+    For a full rack, these are its bingos on an open board.
+    """
+    return self.anagram_index.get("".join(sorted(letters)), [])
+
+  def words_from_letters(self, letters: Sequence[str]) -> Iterator[str]:
+    """Every word that uses some of `letters`, each at most as often as given.
+
+    Each distinct sub-multiset of the letters is looked up with `anagrams`,
+    e.g. at most 2^7 lookups for a rack of 7 different letters.
+    """
+    counts = sorted(Counter(letters).items())
+    for taken in itertools.product(*(range(count + 1) for _, count in counts)):
+      subset = [
+          letter for (letter, _), n in zip(counts, taken) for _ in range(n)
+      ]
+      if subset:
+        yield from self.anagrams(subset)
 
   def __contains__(self, word: str) -> bool:
-    return word.lower() in self._word_set
+    return word.lower() in self._words
 
-  @staticmethod
-  def _insert_into_prefix_trie(
-      trie: ScrabbleDictionary.Trie, word: str
-  ) -> None:
-    for c in word:
-      if c not in trie:
-        trie[c] = {}
-      trie = trie[c]
-    trie[ScrabbleDictionary.END_TOKEN] = {}
+  def __iter__(self) -> Iterator[str]:
+    """Iterate over all words in alphabetical order."""
+    if self._sorted_words is None:
+      yield from sorted(word for word in self._words if word)
+    else:
+      for word in bytes(self._sorted_words).split(b"\n"):
+        yield word.decode()
 
-  @staticmethod
-  def _build_suffix_tree(words: Sequence[str]) -> ScrabbleDictionary.Trie:
-    trie = {}
-    for word in words:
-      ScrabbleDictionary._insert_into_prefix_trie(trie, word[::-1])
-    return trie
+  def get_subtree_with_prefix(
+      self, prefix: str
+  ) -> Optional[ScrabbleDictionary.Trie]:
+    """Return the subtrie of all words starting with `prefix`, if any."""
+    node = self._prefix_dawg.walk(prefix.lower())
+    return None if node is None else dawg.DawgNode(self._prefix_dawg, node)
 
-  @staticmethod
-  def _build_prefix_tree(words: Sequence[str]) -> ScrabbleDictionary.Trie:
-    trie = {}
-    for word in words:
-      ScrabbleDictionary._insert_into_prefix_trie(trie, word)
-    return trie
+  def get_subtree_with_suffix(
+      self, suffix: str
+  ) -> Optional[ScrabbleDictionary.Trie]:
+    """Return the (reversed) subtrie of all words ending with `suffix`, if any."""
+    node = self._suffix_dawg.walk(suffix.lower()[::-1])
+    return None if node is None else dawg.DawgNode(self._suffix_dawg, node)
+
+  def front_hook_mask(self, word: str) -> int:
+    """The mask of letters c for which `c + word` is a word."""
+    node = self._suffix_dawg.walk(word[::-1])
+    return 0 if node is None else self._suffix_dawg.hook_mask(node)
+
+  def back_hook_mask(self, word: str) -> int:
+    """The mask of letters c for which `word + c` is a word."""
+    node = self._prefix_dawg.walk(word)
+    return 0 if node is None else self._prefix_dawg.hook_mask(node)
+
+  def inner_hook_mask(self, prefix: str, suffix: str) -> int:
+    """The mask of letters c for which `prefix + c + suffix` is a word.
+
+    Either affix may be empty, in which case this is the mask of letters that
+    can be hooked onto the front of `suffix` or the back of `prefix`. Front and
+    back hooks are stored for every node of the tries; gaps between two affixes
+    are found by trying each letter, and remembered.
+    """
+    if not prefix:
+      return self.front_hook_mask(suffix)
+    if not suffix:
+      return self.back_hook_mask(prefix)
+
+    key = (prefix, suffix)
+    mask = self._inner_hooks.get(key)
+    if mask is not None:
+      self._inner_hooks.move_to_end(key)
+      return mask
+    mask = self._find_inner_hooks(prefix, suffix)
+    self._inner_hooks[key] = mask
+    if len(self._inner_hooks) > C.INNER_HOOK_CACHE_SIZE:
+      self._inner_hooks.popitem(last=False)
+    return mask
+
+  def _find_inner_hooks(self, prefix: str, suffix: str) -> int:
+    prefix_dawg = self._prefix_dawg
+    node = prefix_dawg.walk(prefix)
+    if node is None:
+      return 0
+    mask = 0
+    for letter, child in prefix_dawg.children(node):
+      end = prefix_dawg.walk(suffix, child)
+      if end is not None and prefix_dawg.is_terminal(end):
+        mask |= letter_bit(letter)
+    return mask
+
+  def compile(self, fname: str) -> None:
+    """Write this dictionary to `fname` in the binary lexicon format.
+
+    The result can be passed to `ScrabbleDictionary.open`, which maps it into
+    memory instead of rebuilding the tries.
+    """
+    lexicon.write(
+        fname,
+        {
+            "words": "\n".join(self).encode(),
+            **self._prefix_dawg.to_sections("prefix"),
+            **self._suffix_dawg.to_sections("suffix"),
+            **self.gaddag.to_sections("gaddag"),
+        },
+    )
 
   @staticmethod
-  def open(fname: str):
+  def open(fname: str) -> ScrabbleDictionary:
+    """Open a word list (one word per line) or a compiled lexicon."""
+    if lexicon.is_lexicon(fname):
+      return ScrabbleDictionary._open_compiled(fname)
+
     with open(fname) as file:
       words = [ScrabbleDictionary._sanitize_line(line) for line in file]
       return ScrabbleDictionary(words)
 
+  @staticmethod
+  def _open_compiled(fname: str) -> ScrabbleDictionary:
+    sections = lexicon.open_mmap(fname)
+    prefix_dawg = Dawg.from_sections(sections, "prefix")
+    dictionary = ScrabbleDictionary.__new__(ScrabbleDictionary)
+    # Words are looked up by walking the DAWG in place; building a set would
+    # take longer than all the rest of the loading.
+    dictionary._init(
+        prefix_dawg,
+        prefix_dawg,
+        Dawg.from_sections(sections, "suffix"),
+        # Lexicons compiled before the GADDAG was added don't have one.
+        gaddag=(
+            Dawg.from_sections(sections, "gaddag")
+            if "gaddag.masks" in sections
+            else None
+        ),
+        sorted_words=sections["words"],
+    )
+    dictionary._fname = fname
+    return dictionary
+
   @staticmethod
   def _sanitize_line(line: str) -> str:
     return "".join(c.lower() for c in line if c.isalpha())
@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+
+from absl.testing import absltest
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+
+_WORDS = ["its", "ifs", "ca", "cat", "ray", "xray"]
+
+
+class ScrabbleDictionaryTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    tempdir = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, tempdir)
+    fname = os.path.join(tempdir, "words.lex")
+    ScrabbleDictionary(_WORDS).compile(fname)
+    self.dictionaries = {
+        "word list": ScrabbleDictionary(_WORDS),
+        "compiled": ScrabbleDictionary.open(fname),
+    }
+
+  def test_contains_words(self):
+    for name, dictionary in self.dictionaries.items():
+      with self.subTest(name):
+        for word in _WORDS:
+          self.assertIn(word, dictionary)
+        self.assertIn("XRAY", dictionary)
+        self.assertNotIn("ct", dictionary)
+
+  def test_non_letters_are_not_words(self):
+    for name, dictionary in self.dictionaries.items():
+      with self.subTest(name):
+        for word in ["it's", "_ifs", "ca1", "x-ray", "cat{", "caté", ""]:
+          self.assertNotIn(word, dictionary)
+
+  def test_subtrees_of_non_letters_are_missing(self):
+    dictionary = self.dictionaries["compiled"]
+    self.assertIsNone(dictionary.get_subtree_with_prefix("c'"))
+    self.assertIsNone(dictionary.get_subtree_with_suffix("-ray"))
+    self.assertNotIn("'", dictionary.prefix_tree)
+
+
+if __name__ == "__main__":
+  absltest.main()
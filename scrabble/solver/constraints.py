@@ -1,13 +1,17 @@
 from __future__ import annotations
-from collections import defaultdict
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, Optional, Tuple
 
 from scrabble.context.scrabble_context import ScrabbleContext
 from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.context.scrabble_board import OFF_BOARD
 from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.solver import rack as R
+from scrabble.util.scrabble_util import ALL_LETTERS_MASK
 from scrabble.util.scrabble_util import Direction
 from scrabble.util.scrabble_util import Point
+from scrabble.util.scrabble_util import letter_bit
 
 
 class InvalidAffixError(ValueError):
@@ -56,6 +60,10 @@ class _AffixConstraint:
 class AffixConstraints:
   _directional_constraints: Dict[Direction, _AffixConstraint]
   _dictionary: ScrabbleDictionary
+  # Reading direction -> (affix mask, word mask). See `_get_reading_masks`.
+  _reading_masks: Dict[Direction, Tuple[int, int]] = field(
+      default_factory=dict, repr=False, compare=False
+  )
 
   @staticmethod
   def create_if_valid(
@@ -87,42 +95,35 @@ class AffixConstraints:
 
   @staticmethod
   def get_constraints_at_point(
-      board: ScrabbleBoard, dictionary: ScrabbleDictionary, coord: Point
+      board: ScrabbleBoard,
+      dictionary: ScrabbleDictionary,
+      coord: Point,
+      cache: Optional[ConstraintsCache] = None,
   ) -> Optional[AffixConstraints]:
     """If the given coordinate is an empty space, return the set of constraints
 
     acting on that space. If there are no constraints, this is interpreted to
     mean a tile can't be played there. If this is the case or there is a tile in
     the space, return `None`.
+
+    The constraints only depend on the tiles next to the space, so they are
+    looked up in `cache` (if given) by those affixes.
     """
     if not board.can_place_tile_at(coord):
       return None
 
-    directional_affixes = defaultdict(lambda: None)
-    for direction in Direction:
-      affix = ""
-      curr_coord = coord.move(direction)
-      while board.has_tile_at(curr_coord):
-        affix += board[curr_coord]
-        curr_coord = curr_coord.move(direction)
-
-      if direction in [Direction.LEFT, Direction.UP]:
-        # The affix must be in reading direction.
-        affix = affix[::-1]
-
-      if affix:
-        directional_affixes[direction] = affix
-
-    if not directional_affixes:
+    i = board.squares.index(coord)
+    if not board.touches_tiles_at_index(i):
       return None
-
-    return AffixConstraints.create_if_valid(
-        dictionary,
-        directional_affixes[Direction.LEFT],
-        directional_affixes[Direction.RIGHT],
-        directional_affixes[Direction.UP],
-        directional_affixes[Direction.DOWN],
+    affixes = tuple(
+        _read_affix(board, i, direction) for direction in _AFFIX_DIRECTIONS
     )
+    if not any(affixes):
+      return None
+
+    if cache is None:
+      return AffixConstraints.create_if_valid(dictionary, *affixes)
+    return cache.get(dictionary, affixes)
 
   def check_constraints(
       self, letter: str, move_direction: Direction
@@ -130,63 +131,72 @@ class AffixConstraints:
     # A valid submove: all letter sequences formed are prefixes or suffixes of
     # known words.
     # A valid move: all letter sequences formed are words.
+    submove_mask, move_mask = self.get_letter_masks(move_direction)
+    bit = letter_bit(letter)
+    return (submove_mask & bit != 0, move_mask & bit != 0)
+
+  def get_letter_masks(self, move_direction: Direction) -> Tuple[int, int]:
+    """Return the masks of letters that form a valid submove and a valid move.
+
+    This is the bitmask equivalent of `check_constraints` for all letters at
+    once, so that it can be intersected with the letters on a rack.
+    """
     if not self._directional_constraints:
       # Should only happen for single-letter words.
-      return (True, letter in self._dictionary)
-
-    (
-        forms_horizontal_affixes,
-        forms_horizontal_words,
-    ) = self._check_constraint_for_reading_direction(letter, Direction.RIGHT)
+      return (ALL_LETTERS_MASK, self._dictionary.prefix_tree.hook_mask)
 
-    (
-        forms_vertical_affixes,
-        forms_vertical_words,
-    ) = self._check_constraint_for_reading_direction(letter, Direction.DOWN)
+    horizontal_affixes, horizontal_words = self._get_reading_masks(
+        Direction.RIGHT
+    )
+    vertical_affixes, vertical_words = self._get_reading_masks(Direction.DOWN)
 
     # A valid submove must have full words in the perpendicular directions.
     if move_direction.is_horizontal():
-      is_valid_submove = forms_horizontal_affixes and forms_vertical_words
+      submove_mask = horizontal_affixes & vertical_words
     else:
-      is_valid_submove = forms_vertical_affixes and forms_horizontal_words
+      submove_mask = vertical_affixes & horizontal_words
 
-    is_valid_move = forms_vertical_words and forms_horizontal_words
+    return (submove_mask, horizontal_words & vertical_words)
 
-    return (is_valid_submove, is_valid_move)
+  def can_extend(self, move_direction: Direction, rack: int) -> bool:
+    """Whether the letters of `rack` could extend the word behind the square.
 
-  def _check_constraint_for_reading_direction(
-      self, letter: str, direction: Direction
-  ) -> Tuple[bool, bool]:
-    forms_valid_affixes = True
-    forms_valid_words = True
-    forward = direction
-    backward = direction.inverse()
+    This only rules out words that are too long for the rack or that need
+    letters it doesn't have (see `Dawg.extension`); the letters may still not
+    fit the squares.
+    """
+    prefix = self._directional_constraints.get(move_direction.inverse())
+    if prefix is None:
+      return True
+    length, required_mask = prefix.trie.extension
+    letter_mask = R.letter_mask(rack)
+    if required_mask & ~letter_mask:
+      return False
+    return length <= R.size(rack)
+
+  def _get_reading_masks(self, direction: Direction) -> Tuple[int, int]:
+    """The letters forming valid affixes and words along `direction`."""
+    masks = self._reading_masks.get(direction)
+    if masks is not None:
+      return masks
 
     # TODO: In this current implementation we assume that we are building the
     # word in one direction which is not true.
+    backward = self._directional_constraints.get(direction.inverse())
+    forward = self._directional_constraints.get(direction)
+    if backward and forward:
+      words = self._dictionary.inner_hook_mask(backward.affix, forward.affix)
+      masks = (words, words)
+    elif backward or forward:
+      # Prefixes are stored in the prefix tree and suffixes (reversed) in the
+      # suffix tree, so either way the letter extends the path from the trie.
+      trie = (backward or forward).trie
+      masks = (trie.child_mask, trie.hook_mask)
+    else:
+      masks = (ALL_LETTERS_MASK, ALL_LETTERS_MASK)
 
-    if backward in self._directional_constraints:
-      if forward in self._directional_constraints:
-        prefix = self._directional_constraints[backward].affix
-        suffix = self._directional_constraints[forward].affix
-        forms_valid_words = (
-            forms_valid_words and prefix + letter + suffix in self._dictionary
-        )
-        forms_valid_affixes = forms_valid_words
-      else:
-        constraint = self._directional_constraints[backward]
-        forms_valid_words = (
-            forms_valid_words and constraint.affix + letter in self._dictionary
-        )
-        forms_valid_affixes = forms_valid_affixes and letter in constraint.trie
-    elif forward in self._directional_constraints:
-      constraint = self._directional_constraints[forward]
-      forms_valid_words = (
-          forms_valid_words and letter + constraint.affix in self._dictionary
-      )
-      forms_valid_affixes = forms_valid_affixes and letter in constraint.trie
-
-    return (forms_valid_affixes, forms_valid_words)
+    self._reading_masks[direction] = masks
+    return masks
 
   def __repr__(self) -> str:
     return ", ".join(
@@ -195,18 +205,104 @@ class AffixConstraints:
     )
 
   def update(
-      self, point: Point, move_direction: Direction, context: ScrabbleContext
+      self,
+      letter: str,
+      point: Point,
+      move_direction: Direction,
+      context: ScrabbleContext,
+  ) -> Optional[AffixConstraints]:
+    """Return the constraints at `point` after playing `letter` just before it.
+
+    Instead of re-deriving every affix from the board, the affix behind `point`
+    is extended by `letter` and the perpendicular constraints are looked up in
+    the context's cross-checks. Returns `None` if no word starts with the
+    extended affix.
+    """
+    backward = move_direction.inverse()
+    prefix = self._directional_constraints.get(backward)
+    affix, trie = (
+        (prefix.affix, prefix.trie)
+        if prefix
+        else ("", self._dictionary.prefix_tree)
+    )
+    if letter not in trie:
+      return None
+
+    # Any tiles after `point` are ignored: the move can't continue past them,
+    # so no moves are explored from the new state.
+    constraints = AffixConstraints(
+        {backward: _AffixConstraint(affix + letter, trie[letter])},
+        self._dictionary,
+    )
+    cross_mask = context.cross_checks.get_mask(point, move_direction)
+    perpendicular = (
+        Direction.DOWN if move_direction.is_horizontal() else Direction.RIGHT
+    )
+    constraints._reading_masks[perpendicular] = (cross_mask, cross_mask)
+    return constraints
+
+
+# The order of the affixes in the arguments of `create_if_valid`.
+_AFFIX_DIRECTIONS = (
+    Direction.LEFT,
+    Direction.RIGHT,
+    Direction.UP,
+    Direction.DOWN,
+)
+
+
+def _read_affix(board: ScrabbleBoard, i: int, direction: Direction) -> str:
+  """The tiles next to square `i` towards `direction`, in reading order."""
+  neighbors = board.squares.neighbors[direction]
+  affix = ""
+  j = neighbors[i]
+  while j != OFF_BOARD and board.has_tile_at_index(j):
+    affix += board.letter_at_index(j)
+    j = neighbors[j]
+  if direction in (Direction.LEFT, Direction.UP):
+    affix = affix[::-1]
+  return affix
+
+
+# The (left, right, up, down) affixes around a square.
+_Affixes = Tuple[str, str, str, str]
+
+
+class ConstraintsCache:
+  """The `AffixConstraints` for each set of affixes around a square.
+
+  Constraints are shared between all the squares (and searches) with the same
+  neighboring tiles, e.g. the across and down start states of a square. The
+  least recently used ones are dropped once there are `max_size` of them, and
+  the cache is emptied when it is used with another dictionary.
+  """
+
+  def __init__(self, max_size: int):
+    self.max_size = max_size
+    self.hits = 0
+    self.misses = 0
+    self._dictionary: Optional[ScrabbleDictionary] = None
+    self._entries: OrderedDict[_Affixes, AffixConstraints] = OrderedDict()
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def get(
+      self, dictionary: ScrabbleDictionary, affixes: _Affixes
   ) -> AffixConstraints:
-    directional_constraints = self._directional_constraints.copy()
-    # Remove all perpendicular constraints; they no longer will apply.
-    for direction in Direction:
-      if direction not in (move_direction, move_direction.inverse()):
-        directional_constraints.pop(direction, None)  # Remove if present.
-
-    existing_constraints = context.solver_constraint_map[point]
-    if existing_constraints:
-      directional_constraints.update(
-          existing_constraints._directional_constraints
-      )
-
-    return AffixConstraints(directional_constraints, context.dictionary)
+    """The constraints for `affixes`, as given to `create_if_valid`."""
+    if dictionary is not self._dictionary:
+      self._entries.clear()
+      self._dictionary = dictionary
+    constraints = self._entries.get(affixes)
+    if constraints is not None:
+      self.hits += 1
+      self._entries.move_to_end(affixes)
+      return constraints
+
+    self.misses += 1
+    constraints = AffixConstraints.create_if_valid(dictionary, *affixes)
+    self._entries[affixes] = constraints
+    if len(self._entries) > self.max_size:
+      self._entries.popitem(last=False)
+    return constraints
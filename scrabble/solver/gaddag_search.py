@@ -0,0 +1,424 @@
+"""Move generation with a GADDAG, starting from anchor squares.
+
+This is the algorithm from Gordon, "A Faster Scrabble Move Generation
+Algorithm" (1994). Every move covers an anchor: an empty square next to a tile,
+or the start square of an empty board. Moves are generated one line (row or
+column) at a time, from the first anchor that they cover: the GADDAG is walked
+from the anchor backwards to the start of the word, then across the separator
+and forwards to its end. Unlike the graph search, words can extend on both
+sides of the tiles on the board and play through them.
+
+Walking backwards stops before the previous anchor of the line, so each move is
+generated once per direction. Every valid single tile is found both across and
+down, so those are only kept across.
+
+The moves along a line only depend on its squares, their cross-checks and
+anchors, and the rack. A `LineCache` keeps them under that signature, so that
+lines a move didn't touch aren't searched again on the next turn.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from scrabble.context.dawg import ROOT
+from scrabble.context.gaddag import SEPARATOR
+from scrabble.context.scrabble_board import EMPTY
+from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.context.scrabble_context import ScrabbleContext
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.solver import rack as R
+from scrabble.solver.search_stats import SearchStats
+from scrabble.solver.state import TerminalState
+from scrabble.solver.state import TileChain
+from scrabble.util import constants as C
+from scrabble.util.scrabble_util import ALPHABET
+from scrabble.util.scrabble_util import Direction
+from scrabble.util.scrabble_util import PlacedTile
+from scrabble.util.scrabble_util import mask_to_letters
+
+# Tiles placed so far, as (position in the line, letter).
+_Placed = Tuple[Tuple[int, str], ...]
+# A move along a line: (anchor, start, end, placed, main word score, word
+# multiplier, cross word score), with positions in the line.
+_Record = Tuple[int, int, int, _Placed, int, int, int]
+
+
+class LineCache:
+  """The moves along lines, by line signature and rack, kept across searches.
+
+  The least recently used lines are dropped once there are `max_size` of them.
+  Moves are only valid for the dictionary they were found with, so the cache
+  is emptied when it is used with another one.
+  """
+
+  def __init__(self, max_size: int):
+    self.max_size = max_size
+    self._dictionary: Optional[ScrabbleDictionary] = None
+    self._entries: OrderedDict[Hashable, List[_Record]] = OrderedDict()
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def use_dictionary(self, dictionary: ScrabbleDictionary) -> None:
+    if dictionary is not self._dictionary:
+      self._entries.clear()
+      self._dictionary = dictionary
+
+  def get(self, key: Hashable) -> Optional[List[_Record]]:
+    records = self._entries.get(key)
+    if records is not None:
+      self._entries.move_to_end(key)
+    return records
+
+  def put(self, key: Hashable, records: List[_Record]) -> None:
+    self._entries[key] = records
+    if len(self._entries) > self.max_size:
+      self._entries.popitem(last=False)
+
+
+class GaddagMoveGenerator:
+  """Generates every valid move for a rack on the context's board."""
+
+  def __init__(
+      self,
+      context: ScrabbleContext,
+      stats: Optional[SearchStats] = None,
+      cache: Optional[LineCache] = None,
+  ):
+    self._context = context
+    self.stats = stats or SearchStats()
+    self._cache = cache
+    # False once a generation was stopped by `should_stop`.
+    self.is_complete = True
+
+  def generate(
+      self,
+      rack: Sequence[str],
+      lines: Optional[Sequence[Tuple[Direction, int]]] = None,
+  ) -> Iterator[TerminalState]:
+    """Yield a `TerminalState` for each valid move using letters of `rack`.
+
+    Args:
+      rack: The letters that can be played.
+      lines: The lines to play along (see `all_lines`). Defaults to all of
+        them.
+    """
+    yield from self.generate_along(rack, prepare_lines(self._context, lines))
+
+  def generate_along(
+      self,
+      rack: Sequence[str],
+      lines: Sequence[Line],
+      should_stop: Optional[Callable[[], bool]] = None,
+  ) -> Iterator[TerminalState]:
+    """Like `generate`, along lines from `prepare_lines` for the context.
+
+    The lines only depend on the board, so they can be prepared once and
+    searched with many racks.
+
+    Args:
+      should_stop: If set, called before each line and each state expanded.
+        Once it returns True, the moves found so far are yielded, generation
+        stops and `is_complete` is set to False.
+    """
+    cache = self._cache
+    if cache is not None:
+      cache.use_dictionary(self._context.dictionary)
+    rack_code = R.encode(rack)
+    for line in lines:
+      if should_stop is not None and should_stop():
+        self.is_complete = False
+        return
+      search = _LineSearch(
+          self._context, line, rack_code, self.stats, should_stop)
+      if cache is None:
+        records = search.run()
+      else:
+        key = (line.signature, rack_code)
+        records = cache.get(key)
+        if records is None:
+          self.stats.line_cache_misses += 1
+          records = search.run()
+          # The moves of a stopped search are incomplete.
+          if not search.is_stopped:
+            cache.put(key, records)
+        else:
+          self.stats.line_cache_hits += 1
+      yield from search.moves(records)
+      if search.is_stopped:
+        self.is_complete = False
+        return
+
+
+def all_lines(board: ScrabbleBoard) -> List[Tuple[Direction, int]]:
+  """Every row and column, as the move direction along it and its index."""
+  # Horizontal lines are indexed by `y` and vertical ones by `x`.
+  return [
+      *((Direction.RIGHT, y) for y in range(board.height)),
+      *((Direction.DOWN, x) for x in range(board.width)),
+  ]
+
+
+def prepare_lines(
+    context: ScrabbleContext,
+    lines: Optional[Sequence[Tuple[Direction, int]]] = None,
+) -> List[Line]:
+  """The given lines (by default all of them) that have an anchor."""
+  board = context.board
+  is_anchor = [False] * len(board.squares.points)
+  for i in context.anchors:
+    is_anchor[i] = True
+  prepared = []
+  for direction, index in lines or all_lines(board):
+    anchors = [is_anchor[i] for i in board.squares.line(direction, index)]
+    if any(anchors):
+      prepared.append(Line(context, direction, index, anchors))
+  return prepared
+
+
+class Line:
+  """A row or column with its squares, cross-checks and anchors.
+
+  These only depend on the board, not on the rack.
+  """
+
+  def __init__(
+      self,
+      context: ScrabbleContext,
+      direction: Direction,
+      index: int,
+      anchors: List[bool],
+  ):
+    self.direction = direction
+    self.index = index
+    self.anchors = anchors
+
+    letters, letter_multipliers, word_multipliers = context.board.get_line(
+        direction, index
+    )
+    self.letters = letters.tolist()
+    self.letter_multipliers = letter_multipliers.tolist()
+    self.word_multipliers = word_multipliers.tolist()
+    squares = context.board.squares
+    indices = squares.line(direction, index)
+    self.points = [squares.points[i] for i in indices]
+    cross_checks = context.cross_checks
+    self.cross_masks = [
+        cross_checks.get_mask_at_index(i, direction) for i in indices
+    ]
+    self.cross_scores = [
+        cross_checks.get_score_at_index(i, direction) for i in indices
+    ]
+    # Everything that the moves along the line depend on, but the rack.
+    self.signature = (
+        direction,
+        index,
+        tuple(self.letters),
+        tuple(self.letter_multipliers),
+        tuple(self.word_multipliers),
+        tuple(self.cross_masks),
+        tuple(self.cross_scores),
+        tuple(anchors),
+    )
+
+
+class _LineSearch:
+  """The moves along a single line, found with Gordon's Gen/GoOn recursion."""
+
+  def __init__(
+      self,
+      context: ScrabbleContext,
+      line: Line,
+      rack: int,
+      stats: SearchStats,
+      should_stop: Optional[Callable[[], bool]] = None,
+  ):
+    self._context = context
+    self._gaddag = context.dictionary.gaddag
+    self._direction = line.direction
+    self._anchors = line.anchors
+    self._letters = line.letters
+    self._letter_multipliers = line.letter_multipliers
+    self._word_multipliers = line.word_multipliers
+    self._points = line.points
+    self._cross_masks = line.cross_masks
+    self._cross_scores = line.cross_scores
+    self._stats = stats
+    self._should_stop = should_stop
+    # Set once `should_stop` returns True: no more states are expanded.
+    self.is_stopped = False
+
+    self._rack = rack
+    self._anchor = -1
+    self._records: List[_Record] = []
+    self._is_vertical = line.direction.is_vertical()
+
+  def run(self) -> List[_Record]:
+    for anchor, is_anchor in enumerate(self._anchors):
+      if is_anchor:
+        self._anchor = anchor
+        self._gen(anchor, ROOT, self._rack, (), 0, 1, 0, start=None)
+    return self._records
+
+  def moves(self, records: Sequence[_Record]) -> Iterator[TerminalState]:
+    """The moves found by `run` (on this line or one with its signature)."""
+    for (
+        anchor,
+        start,
+        end,
+        placed,
+        main_score,
+        word_multiplier,
+        cross_score,
+    ) in records:
+      rack = self._rack
+      tiles = None
+      for pos, letter in sorted(placed):
+        rack = R.remove(rack, letter)
+        tiles = TileChain(tiles, PlacedTile(letter, self._points[pos]))
+      yield TerminalState(
+          rack,
+          tiles,
+          self._points[anchor],
+          None,
+          self._direction,
+          False,
+          main_word_score=main_score,
+          main_word_length=end - start + 1,
+          word_multiplier=word_multiplier,
+          cross_word_score=cross_score,
+          num_tiles=len(placed),
+          _context=self._context,
+      )
+
+  def _gen(
+      self,
+      pos: int,
+      node: int,
+      rack: int,
+      placed: _Placed,
+      main_score: int,
+      word_multiplier: int,
+      cross_score: int,
+      start: Optional[int],
+  ) -> None:
+    """Cover square `pos`, either with its tile or with one from the rack.
+
+    `start` is the first square of the word, or `None` while walking
+    backwards from the anchor.
+    """
+    if self.is_stopped:
+      return
+    if self._should_stop is not None and self._should_stop():
+      self.is_stopped = True
+      return
+    self._stats.states_expanded += 1
+    gaddag = self._gaddag
+    code = self._letters[pos]
+    if code != EMPTY:
+      letter = ALPHABET[code - 1]
+      child = gaddag.child(node, letter)
+      if child is not None:
+        self._go_on(
+            pos,
+            child,
+            rack,
+            placed,
+            main_score + C.TILE_SCORES[letter],
+            word_multiplier,
+            cross_score,
+            start,
+        )
+      return
+
+    allowed_mask = (
+        gaddag.child_mask(node) & self._cross_masks[pos] & R.letter_mask(rack)
+    )
+    if not allowed_mask:
+      return
+    letter_multiplier = self._letter_multipliers[pos]
+    square_word_multiplier = self._word_multipliers[pos]
+    square_cross_score = self._cross_scores[pos]
+    for letter in mask_to_letters(allowed_mask):
+      letter_score = C.TILE_SCORES[letter] * letter_multiplier
+      new_cross_score = cross_score
+      if square_cross_score is not None:
+        new_cross_score += (
+            square_cross_score + letter_score
+        ) * square_word_multiplier
+      self._go_on(
+          pos,
+          gaddag.child(node, letter),
+          R.remove(rack, letter),
+          (*placed, (pos, letter)),
+          main_score + letter_score,
+          word_multiplier * square_word_multiplier,
+          new_cross_score,
+          start,
+      )
+
+  def _go_on(
+      self,
+      pos: int,
+      node: int,
+      rack: int,
+      placed: _Placed,
+      main_score: int,
+      word_multiplier: int,
+      cross_score: int,
+      start: Optional[int],
+  ) -> None:
+    """Continue the word after covering square `pos`, reaching `node`."""
+    gaddag = self._gaddag
+    letters = self._letters
+    args = (rack, placed, main_score, word_multiplier, cross_score)
+    totals = (placed, main_score, word_multiplier, cross_score)
+    if start is None:
+      # Walking backwards: the word currently spans [pos, anchor].
+      anchor = self._anchor
+      before, after = pos - 1, anchor + 1
+      before_is_free = before < 0 or letters[before] == EMPTY
+      after_is_free = after >= len(letters) or letters[after] == EMPTY
+      if before_is_free and after_is_free:
+        if anchor > pos and gaddag.is_terminal(node):
+          self._record(pos, anchor, *totals)
+        elif anchor == pos and self._cross_scores[pos] is not None:
+          # A single tile only forms the perpendicular word.
+          self._record(pos, anchor, *totals)
+
+      if before >= 0 and (letters[before] != EMPTY or not self._anchors[before]):
+        self._gen(before, node, *args, start=None)
+      if before_is_free and after < len(letters):
+        separator = gaddag.child(node, SEPARATOR)
+        if separator is not None:
+          self._gen(after, separator, *args, start=pos)
+    else:
+      after = pos + 1
+      after_is_free = after >= len(letters) or letters[after] == EMPTY
+      if after_is_free and gaddag.is_terminal(node):
+        self._record(start, pos, *totals)
+      if after < len(letters):
+        self._gen(after, node, *args, start=start)
+
+  def _record(
+      self,
+      start: int,
+      end: int,
+      placed: _Placed,
+      main_score: int,
+      word_multiplier: int,
+      cross_score: int,
+  ) -> None:
+    if len(placed) == 1 and self._is_vertical:
+      self._stats.duplicates_skipped += 1
+      return
+    self._records.append((
+        self._anchor,
+        start,
+        end,
+        placed,
+        main_score,
+        word_multiplier,
+        cross_score,
+    ))
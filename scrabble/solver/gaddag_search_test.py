@@ -0,0 +1,54 @@
+from os import path
+
+from absl.testing import absltest
+from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.context.scrabble_context import ScrabbleContext
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.solver.gaddag_search import GaddagMoveGenerator
+from scrabble.solver.scrabble_solver import ComputerPlayer
+from scrabble.util import constants as C
+
+_RACKS = ["soiwnfp", "eeaiiox", "qzjxkaa"]
+
+
+def _open_dictionary() -> ScrabbleDictionary:
+  if path.exists(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH):
+    return ScrabbleDictionary.open(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH)
+  return ScrabbleDictionary.open(C.DEFAULT_DICTIONARY_FILEPATH)
+
+
+class GaddagMoveGeneratorTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.context = ScrabbleContext(
+        ScrabbleBoard.open(C.DEFAULT_BOARD_FILEPATH), _open_dictionary()
+    )
+
+  def test_finds_every_move_of_the_graph_search(self):
+    for rack in _RACKS:
+      with self.subTest(rack=rack):
+        player = ComputerPlayer("test", rack, self.context, engine="graph")
+        graph_moves = {
+            frozenset(move.placed_tiles)
+            for move, _ in player.iter_moves(self.context)
+        }
+        gaddag_moves = {
+            frozenset(state.move.placed_tiles)
+            for state in GaddagMoveGenerator(self.context).generate(rack)
+        }
+        self.assertNotEmpty(graph_moves)
+        self.assertEmpty(graph_moves - gaddag_moves)
+
+  def test_scores_match_score_move(self):
+    for rack in _RACKS:
+      for state in GaddagMoveGenerator(self.context).generate(rack):
+        score = self.context.score_move(state.move, check_valid=True)
+        self.assertEqual(
+            state.total_score, score["total_score"], msg=str(state.move)
+        )
+
+
+if __name__ == "__main__":
+  absltest.main()
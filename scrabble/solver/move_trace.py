@@ -0,0 +1,90 @@
+"""A log of the candidate moves considered by searches, to replay offline.
+
+Printing every candidate board during a search (`print_all_valid_states`)
+slows it down by orders of magnitude. A `MoveTraceWriter` only appends a short
+line per candidate instead, and `read_trace` gives the searches back so that
+their boards can be rendered later (see `render_trace_main`).
+
+The trace is a JSONL file. Each search starts with a line holding the board
+and the rack:
+
+  {"board":[["w3","-","-","l2",...],...],"rack":"soiwnfp"}
+
+followed by a line per candidate, in the order they were considered:
+
+  {"score":24,"tiles":[[7,3,"f"],[7,4,"o"]]}
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import IO, Iterator, List, Sequence, Tuple
+
+from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.util.scrabble_move import Move
+from scrabble.util.scrabble_util import PlacedTile
+from scrabble.util.scrabble_util import Point
+
+
+@dataclass
+class TracedSearch:
+  """A search read back from a trace."""
+
+  board: ScrabbleBoard
+  rack_letters: str
+  # The candidate moves and their total scores.
+  candidates: List[Tuple[Move, int]]
+
+
+class MoveTraceWriter:
+  """Appends searches and their candidate moves to a trace file."""
+
+  def __init__(self, file: IO[str]):
+    self._file = file
+
+  @staticmethod
+  def open(filepath: str) -> MoveTraceWriter:
+    return MoveTraceWriter(open(filepath, "a"))
+
+  def start_search(
+      self, board: ScrabbleBoard, rack_letters: Sequence[str]
+  ) -> None:
+    rows = [
+        [board[Point(x, y)] for y in range(board.height)]
+        for x in range(board.width)
+    ]
+    self._write({"board": rows, "rack": "".join(rack_letters)})
+
+  def record(self, move: Move, score: int) -> None:
+    tiles = [
+        [tile.location.x, tile.location.y, tile.letter]
+        for tile in move.placed_tiles
+    ]
+    self._write({"score": score, "tiles": tiles})
+
+  def close(self) -> None:
+    self._file.close()
+
+  def _write(self, record: dict) -> None:
+    self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def read_trace(file: IO[str]) -> Iterator[TracedSearch]:
+  """The searches in a trace written by `MoveTraceWriter`, in order."""
+  search = None
+  for line in file:
+    record = json.loads(line)
+    if "board" in record:
+      if search is not None:
+        yield search
+      search = TracedSearch(ScrabbleBoard(record["board"]), record["rack"], [])
+    elif search is None:
+      raise ValueError("The trace has a move before the first search.")
+    else:
+      move = Move([
+          PlacedTile(letter, Point(x, y)) for x, y, letter in record["tiles"]
+      ])
+      search.candidates.append((move, record["score"]))
+  if search is not None:
+    yield search
@@ -37,5 +37,4 @@ class TotalScore(PriorityCalculator):
   _context: ScrabbleContext
 
   def calculate_priority(self, state: State) -> float:
-    score_so_far = self._context.score_move(state.move, check_valid=False)
-    return score_so_far["total_score"]
+    return state.total_score
@@ -3,13 +3,19 @@ from __future__ import annotations
 from dataclasses import dataclass
 import random
 
+from scrabble.solver import rack as R
 from scrabble.solver.state import TerminalState
 from scrabble.solver.state import State
+from scrabble.context.scrabble_board import OFF_BOARD
 from scrabble.context.scrabble_context import ScrabbleContext
+from scrabble.util import constants as C
 
 
 class PruningStrategy:
 
+  def prepare(self, context: ScrabbleContext) -> None:
+    """Called at the start of each search, with the context searched in."""
+
   def should_prune(self, best_state: TerminalState, curr_state: State) -> bool:
     raise NotImplementedError()
 
@@ -24,7 +30,7 @@ class PruningStrategy:
       p = 0.5 if option == "random" else float(option.split(":")[-1])
       return Random(p)
     elif option == "greedy_heuristic":
-      return GreedyHeuristic()
+      return GreedyHeuristic(context)
 
 
 class NeverPrune(PruningStrategy):
@@ -42,6 +48,81 @@ class Random(PruningStrategy):
 
 
 class GreedyHeuristic(PruningStrategy):
-  # TODO: implement
+  """Branch and bound: prune states that can't beat the best move so far.
+
+  The bound is admissible (it never underestimates the score of a move that
+  extends the state), so the best `total_score` found is the same as without
+  pruning. Rankers that don't maximize the score may choose differently.
+  """
+
+  def __init__(self, context: ScrabbleContext):
+    self._context = context
+
+  def prepare(self, context: ScrabbleContext) -> None:
+    self._context = context
+
   def should_prune(self, best_state: TerminalState, curr_state: State) -> bool:
-    raise NotImplementedError()
+    if best_state is None:
+      return False
+    return self.upper_bound(curr_state) <= best_state.total_score
+
+  def upper_bound(self, state: State) -> int:
+    """An upper bound on the score of any move that extends `state`.
+
+    The remaining tiles can at most cover the empty squares ahead of the state
+    along its direction. Every word multiplier there is assumed to apply to the
+    main word, and each square's letter coefficient (its letter multiplier
+    times the main word's multiplier, plus the perpendicular word's if it has
+    one) is paired with the highest remaining tile scores.
+    """
+    board = self._context.board
+    cross_checks = self._context.cross_checks
+    letters_left = state.letters_left
+    num_letters = len(letters_left)
+
+    word_multiplier = state.word_multiplier
+    cross_word_score = state.cross_word_score
+    # (letter multiplier, word multiplier, forms a perpendicular word).
+    squares = []
+    neighbors = board.squares.neighbors[state.direction]
+    i = board.squares.index(state.point)
+    rack_mask = R.letter_mask(state.rack)
+    # The graph search only places a tile if the square after it is empty, and
+    # can't go past a square that none of the remaining letters fit in.
+    while (
+        len(squares) < num_letters
+        and neighbors[i] != OFF_BOARD
+        and not board.has_tile_at_index(neighbors[i])
+        and cross_checks.get_mask_at_index(i, state.direction) & rack_mask
+    ):
+      letter_multiplier, square_word_multiplier = board.multipliers_at_index(i)
+      cross_score = cross_checks.get_score_at_index(i, state.direction)
+      if cross_score is not None:
+        cross_word_score += cross_score * square_word_multiplier
+      word_multiplier *= square_word_multiplier
+      squares.append(
+          (letter_multiplier, square_word_multiplier, cross_score is not None)
+      )
+      i = neighbors[i]
+
+    coefficients = sorted(
+        (
+            letter_multiplier * (word_multiplier + square_word_multiplier)
+            if has_cross_word
+            else letter_multiplier * word_multiplier
+            for letter_multiplier, square_word_multiplier, has_cross_word
+            in squares
+        ),
+        reverse=True,
+    )
+    letter_scores = sorted(
+        (C.TILE_SCORES[letter] for letter in letters_left), reverse=True
+    )
+    bound = state.main_word_score * word_multiplier + cross_word_score
+    bound += sum(
+        coefficient * letter_score
+        for coefficient, letter_score in zip(coefficients, letter_scores)
+    )
+    if state.num_tiles + len(squares) >= C.TILES_DRAWN_PER_PLAYER:
+      bound += C.BINGO_BONUS
+    return bound
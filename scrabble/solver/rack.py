@@ -0,0 +1,75 @@
+"""Racks of letters, encoded as immutable integers.
+
+A rack is a multiset of letters. It is stored in a single int:
+
+- bits 0-25 are the letters on the rack, as a letter mask (see
+  `scrabble_util.letters_to_mask`),
+- from bit 32, each letter has a 4 bit count, in alphabetical order.
+
+Taking a tile is then a subtraction, and the letters that can be played are
+read off the low bits without looking at the counts.
+"""
+
+from typing import Iterable, List
+
+from scrabble.util.scrabble_util import ALL_LETTERS_MASK
+from scrabble.util.scrabble_util import ALPHABET
+from scrabble.util.scrabble_util import letter_code
+from scrabble.util.scrabble_util import mask_to_letters
+
+_COUNTS_SHIFT = 32
+_COUNT_BITS = 4
+_MAX_COUNT = (1 << _COUNT_BITS) - 1
+
+EMPTY_RACK = 0
+
+
+def encode(letters: Iterable[str]) -> int:
+  """The rack holding `letters`, which must be lowercase ASCII letters."""
+  rack = EMPTY_RACK
+  for letter in letters:
+    if letter not in ALPHABET:
+      raise ValueError(f"Not a letter: {letter!r}")
+    if count(rack, letter) == _MAX_COUNT:
+      raise ValueError(f"More than {_MAX_COUNT} of {letter!r} in a rack")
+    rack = add(rack, letter)
+  return rack
+
+
+def decode(rack: int) -> List[str]:
+  """The letters on `rack`, in alphabetical order."""
+  return [
+      letter
+      for letter in mask_to_letters(letter_mask(rack))
+      for _ in range(count(rack, letter))
+  ]
+
+
+def letter_mask(rack: int) -> int:
+  """A letter mask of the distinct letters on `rack`."""
+  return rack & ALL_LETTERS_MASK
+
+
+def count(rack: int, letter: str) -> int:
+  return (rack >> (_COUNTS_SHIFT + _COUNT_BITS * letter_code(letter))) & _MAX_COUNT
+
+
+def size(rack: int) -> int:
+  """The number of tiles on `rack`."""
+  return sum(
+      count(rack, letter) for letter in mask_to_letters(letter_mask(rack))
+  )
+
+
+def add(rack: int, letter: str) -> int:
+  code = letter_code(letter)
+  return (rack + (1 << (_COUNTS_SHIFT + _COUNT_BITS * code))) | (1 << code)
+
+
+def remove(rack: int, letter: str) -> int:
+  """`rack` without one `letter`, which must be on it."""
+  code = letter_code(letter)
+  rack -= 1 << (_COUNTS_SHIFT + _COUNT_BITS * code)
+  if not (rack >> (_COUNTS_SHIFT + _COUNT_BITS * code)) & _MAX_COUNT:
+    rack &= ~(1 << code)
+  return rack
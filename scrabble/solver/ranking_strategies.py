@@ -35,7 +35,7 @@ class Random(RankingStrategy):
   p: float
 
   def is_better_than(self, state: TerminalState, other: TerminalState) -> bool:
-    if state.score["total_score"] > other.score["total_score"]:
+    if state.total_score > other.total_score:
       prob = self.p
     else:
       prob = 1 - self.p
@@ -46,7 +46,7 @@ class Random(RankingStrategy):
 class MaxScore(RankingStrategy):
 
   def is_better_than(self, state: TerminalState, other: TerminalState) -> bool:
-    return state.score["total_score"] > other.score["total_score"]
+    return state.total_score > other.total_score
 
 
 class MostWords(RankingStrategy):
@@ -0,0 +1,83 @@
+"""Checks the solver's incremental scores against `ScrabbleContext.score_move`.
+
+Boards are generated by letting the solver play against itself from the empty
+board with random racks. On each board, every state reached while searching
+for a few random racks must have the same `total_score` as a full rescoring of
+its move.
+"""
+
+import random
+from typing import Tuple
+
+from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.context.scrabble_context import ScrabbleContext
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.context.tile_pool import TilePool
+from scrabble.solver.scrabble_solver import ComputerPlayer
+from scrabble.util import constants as C
+
+
+def check_all_states(context: ScrabbleContext, rack: str) -> int:
+  """Expand every state for `rack`, returning the number checked.
+
+  Raises:
+    AssertionError: If a state's score differs from `score_move`'s.
+  """
+  player = ComputerPlayer("parity", rack, context)
+  rack_letters = list(rack)
+  states = list(
+      player._get_start_states(
+          context,
+          rack_letters,
+          player._get_start_points(context, rack_letters),
+      )
+  )
+  num_checked = 0
+  while states:
+    state = states.pop()
+    terminal_states, child_states = state.get_child_states(context)
+    for child_state in [*terminal_states, *child_states]:
+      expected = context.score_move(child_state.move)["total_score"]
+      if child_state.total_score != expected:
+        raise AssertionError(
+            f"{child_state.move} scored {child_state.total_score}, but"
+            f" score_move gives {expected}:\n"
+            + context.board.printable_board(child_state.move.placed_tiles)
+        )
+      num_checked += 1
+    states.extend(child_states)
+  return num_checked
+
+
+def check_games(
+    dictionary: ScrabbleDictionary,
+    num_boards: int,
+    num_turns: int,
+    num_racks: int,
+    seed: int = 0,
+) -> Tuple[int, int]:
+  """Check the states on the boards of `num_boards` generated games.
+
+  Returns:
+    The number of board/rack pairs and the number of states checked.
+  """
+  random.seed(seed)
+  tile_pool = TilePool(C.TILE_COUNTS, is_infinite=True)
+
+  num_positions = 0
+  num_checked = 0
+  for _ in range(num_boards):
+    context = ScrabbleContext(
+        ScrabbleBoard.open(C.RESOURCE_ROOT + "/empty_board.txt"), dictionary
+    )
+    for _ in range(num_turns):
+      for _ in range(num_racks):
+        rack = "".join(tile_pool.draw(C.TILES_DRAWN_PER_PLAYER))
+        num_checked += check_all_states(context, rack)
+        num_positions += 1
+
+      rack = "".join(tile_pool.draw(C.TILES_DRAWN_PER_PLAYER))
+      move = ComputerPlayer("parity", rack, context).choose_next_move(context)
+      if move.placed_tiles:
+        context = context.execute_move(move)
+  return num_positions, num_checked
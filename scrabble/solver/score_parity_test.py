@@ -0,0 +1,25 @@
+from os import path
+
+from absl.testing import absltest
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.solver import score_parity
+from scrabble.util import constants as C
+
+
+class ScoreParityTest(absltest.TestCase):
+
+  def test_incremental_scores_match_score_move(self):
+    if path.exists(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH):
+      dictionary_filepath = C.DEFAULT_COMPILED_DICTIONARY_FILEPATH
+    else:
+      dictionary_filepath = C.DEFAULT_DICTIONARY_FILEPATH
+    dictionary = ScrabbleDictionary.open(dictionary_filepath)
+    num_positions, num_checked = score_parity.check_games(
+        dictionary, num_boards=1, num_turns=3, num_racks=3, seed=0
+    )
+    self.assertEqual(num_positions, 9)
+    self.assertGreater(num_checked, 0)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
-from collections import defaultdict
 from concurrent import futures
+import heapq
 from dataclasses import dataclass, field
+import itertools
 import queue as Q
-from typing import Awaitable, Callable, Optional, Sequence, Tuple, Any
+import time
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Any
 
+from scrabble.solver import gaddag_search
 from scrabble.solver import priority_calculators
 from scrabble.solver import pruning_strategies
+from scrabble.solver import rack as R
 from scrabble.solver import ranking_strategies
+from scrabble.context.cross_checks import CrossChecks
 from scrabble.solver.constraints import AffixConstraints
+from scrabble.solver.constraints import ConstraintsCache
+from scrabble.solver.gaddag_search import GaddagMoveGenerator
+from scrabble.solver.gaddag_search import LineCache
+from scrabble.solver.move_trace import MoveTraceWriter
+from scrabble.solver.search_stats import SearchStats
+from scrabble.context.scrabble_board import OFF_BOARD
 from scrabble.context.scrabble_context import Move
 from scrabble.context.scrabble_context import MoveType
 from scrabble.context.scrabble_context import ScrabbleBoard
@@ -17,84 +28,282 @@ from scrabble.context.scrabble_context import ScrabbleContext
 from scrabble.context.scrabble_context import ScrabbleDictionary
 from scrabble.solver.state import State
 from scrabble.solver.state import TerminalState
+from scrabble.solver.state import TileChain
 from scrabble.util import constants as C
+from scrabble.util.scrabble_util import ALPHABET
 from scrabble.util.scrabble_util import Direction
+from scrabble.util.scrabble_util import PlacedTile
 from scrabble.util.scrabble_util import Point
 from scrabble.context.scrabble_player import AbstractPlayer
 
 
-Future = Awaitable
 Score = dict
 
 
 @dataclass(order=True)
 class _QueueItem:
     priority: int
+    # Breaks ties in insertion order, so that the states explored (and the
+    # move chosen among equal ones) don't depend on which states were pruned.
+    sequence_number: int
     state: Any = field(compare=False)
 
 
-class _ScrabbleWorkerPool(object):
+@dataclass
+class SearchResult:
+    """The outcome of `ComputerPlayer.search_next_move`."""
 
-    def __init__(self, context: ScrabbleContext):
-        self._context = context
-        self._executor = futures.ThreadPoolExecutor(
-            max_workers=C.MAX_NUM_WORKERS)
+    # The best moves found, best first. Empty if there is no valid move (or
+    # none was found within the budget).
+    top_states: List[TerminalState]
+    # False if the search ran out of budget before exploring every state, in
+    # which case a better move may exist.
+    is_complete: bool
+    stats: SearchStats
 
-    def shutdown(self):
-        self._executor.shutdown()
+    @property
+    def best_state(self) -> Optional[TerminalState]:
+        return self.top_states[0] if self.top_states else None
+
+    @property
+    def move(self) -> Move:
+        if self.best_state is None:
+            # TODO: Figure out which letters to exchange.
+            return Move([], MoveType.EXCHANGE)
+        return self.best_state.move
 
-    # Methods for spawning new workers.
-    def best_row_move_async(self, row_idx: int) -> Future[Tuple[Score, Move]]:
-        return self._executor.submit(self._best_row_move, row_idx)
 
-    def best_column_move_async(self, col_idx: int) -> Future[Tuple[Score, Move]]:
-        return self._executor.submit(self._best_column_move, col_idx)
+@dataclass
+class _SearchBudget:
+    # A `time.monotonic()` timestamp.
+    deadline: Optional[float]
+    max_expansions: Optional[int]
+    # Set once `is_exhausted` returns True.
+    exhausted: bool = False
 
-    def _best_row_move(self, row_idx: int) -> Tuple[Score, Move]:
-        """Find the most optimal move along row `row_idx`.
+    def is_exhausted(self, stats: SearchStats) -> bool:
+        if (self.max_expansions is not None
+                and stats.states_expanded >= self.max_expansions):
+            self.exhausted = True
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            self.exhausted = True
+        return self.exhausted
 
-        Run by a separate worker.
-        """
-        raise NotImplementedError()
 
-    def _best_column_move(self, col_idx: int) -> Tuple[Score, Move]:
-        """Find the most optimal move along column `col_idx`.
+class _TranspositionTable(object):
+    """The moves already seen during a search.
 
-        Run by a separate worker.
-        """
-        raise NotImplementedError()
-
-    def _solve_prefix(
-        self, prefix: str, coord: Point, direction: Direction
-    ) -> Tuple[Score, Move]:
-        letters = self._context.player_letters
-        subtree: ScrabbleDictionary.Trie = (
-            self._context.dictionary.get_subtree_with_prefix(prefix)
-        )
-        q: Q.Queue[State] = Q.Queue()
+    The same move can be reached from several start states, e.g. a single tile
+    both across and down, but only needs to be ranked once.
 
-        best_score = 0
-        best_move = None
-        # state = (move, letters_left, curr_coord, subtrie)
-        while q:
-            state = q.get()
-            move, letters_left, curr_coord, subtrie = state
+    Partial moves don't need to be tracked: each start state is at a different
+    square or direction, and a state tries each of its letters once, so no two
+    states place the same tiles.
+    """
+
+    def __init__(self, stats: SearchStats):
+        self._stats = stats
+        self._move_keys = set()
+
+    def is_new_move(self, state: State) -> bool:
+        key = state.move_key()
+        if key in self._move_keys:
+            self._stats.duplicates_skipped += 1
+            return False
+        self._move_keys.add(key)
+        return True
+
+
+class _RankedState(object):
+    """A heap entry that orders states from the worst to the best."""
+
+    def __init__(self, state: TerminalState, sequence_number: int,
+                 ranker: ranking_strategies.RankingStrategy):
+        self.state = state
+        self.sequence_number = sequence_number
+        self._ranker = ranker
+
+    def __lt__(self, other: _RankedState) -> bool:
+        if self._ranker.is_better_than(other.state, self.state):
+            return True
+        if self._ranker.is_better_than(self.state, other.state):
+            return False
+        # Of equally ranked states, the one found first is kept.
+        return self.sequence_number > other.sequence_number
+
+
+class _TopStates(object):
+    """The `k` best states seen so far, in a bounded min-heap.
+
+    The root of the heap is the worst of the states kept, i.e. the k-th best
+    one, which a new state has to beat to be kept.
+    """
+
+    def __init__(self, ranker: ranking_strategies.RankingStrategy, k: int):
+        if k < 1:
+            raise ValueError(f"Expected at least one move, got k={k}")
+        self._ranker = ranker
+        self._k = k
+        self._heap: List[_RankedState] = []
+        self._sequence_numbers = itertools.count()
+
+    def add(self, state: TerminalState) -> None:
+        if len(self._heap) < self._k:
+            heapq.heappush(self._heap, _RankedState(
+                state, next(self._sequence_numbers), self._ranker))
+        elif self._ranker.is_better_than(state, self._heap[0].state):
+            heapq.heapreplace(self._heap, _RankedState(
+                state, next(self._sequence_numbers), self._ranker))
+
+    def threshold(self) -> Optional[TerminalState]:
+        """The state that a new one has to beat, or None if any would do."""
+        if len(self._heap) < self._k:
+            return None
+        return self._heap[0].state
+
+    def best_first(self) -> List[TerminalState]:
+        return [entry.state for entry in sorted(self._heap, reverse=True)]
+
+
+# The dictionary of a `_SearchPool` worker process, loaded once per worker.
+_worker_dictionary: Optional[ScrabbleDictionary] = None
+
+
+def _init_worker(dictionary: ScrabbleDictionary) -> None:
+    global _worker_dictionary
+    _worker_dictionary = dictionary
+
+
+def _search_in_worker(
+    player_options: dict,
+    rack_letters: Sequence[str],
+    board: ScrabbleBoard,
+    cross_check_tables: Tuple,
+    work: Sequence[Any],
+    budget: _SearchBudget,
+    k: int,
+) -> Tuple[List[TerminalState], bool, SearchStats]:
+    """Search part of the moves in a worker process. See `_SearchPool`."""
+    context = ScrabbleContext(
+        board,
+        _worker_dictionary,
+        CrossChecks(board, _worker_dictionary, *cross_check_tables),
+    )
+    player = ComputerPlayer("worker", rack_letters, context, **player_options)
+    top_states, is_complete = player._search_part(
+        context, rack_letters, work, budget, k)
+    _detach(top_states)
+    return top_states, is_complete, player.search_stats
+
+
+def _search_racks_in_worker(
+    player_options: dict,
+    racks: Sequence[Sequence[str]],
+    board: ScrabbleBoard,
+    cross_check_tables: Tuple,
+    budget: _SearchBudget,
+    k: int,
+) -> List[SearchResult]:
+    """Search for several whole racks in a worker process."""
+    context = ScrabbleContext(
+        board,
+        _worker_dictionary,
+        CrossChecks(board, _worker_dictionary, *cross_check_tables),
+    )
+    player = ComputerPlayer("worker", "", context, **player_options)
+    results = player._search_racks_here(context, racks, budget, k)
+    for result in results:
+        _detach(result.top_states)
+    return results
+
+
+def _detach(states: Sequence[TerminalState]) -> None:
+    """Prepare states found by a worker to be sent back to the main process."""
+    for state in states:
+        # The constraints and context refer to this process's dictionary.
+        state.constraints = None
+        state._context = None
+
+
+class _SearchPool(object):
+    """A pool of processes that search disjoint parts of the moves in parallel.
+
+    The search is CPU-bound, so threads would be serialized by the GIL. Each
+    worker loads the dictionary once, when it starts; compiled lexicons are
+    reopened (and so shared) rather than copied.
+    """
+
+    def __init__(self, dictionary: ScrabbleDictionary, num_workers: int):
+        self.dictionary = dictionary
+        self.num_workers = num_workers
+        self._executor = futures.ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(dictionary,),
+        )
 
-            # todo: check coords and make sure we don't collide with word after
-            for letter in set(letters_left):
-                # If this condition is True, words with prefix `prefix+letter` exist.
-                if letter in subtrie:
-                    new_state = state.update_state(direction)
-                    if new_state.is_valid(self._context):
-                        q.put(new_state)
+    def shutdown(self):
+        self._executor.shutdown()
 
-            if ScrabbleDictionary.END_TOKEN in subtrie:
-                curr_score = self._context.score_move(move)["total_score"]
-                if curr_score > best_score:
-                    best_score = curr_score
-                    best_move = move
+    def search(
+        self,
+        player_options: dict,
+        rack_letters: Sequence[str],
+        context: ScrabbleContext,
+        work: Sequence[Any],
+        budget: _SearchBudget,
+        k: int,
+    ) -> Sequence[Tuple[List[TerminalState], bool, SearchStats]]:
+        """Split `work` (start points or lines) between the workers."""
+        # A few chunks per worker evens out the load, since some parts of the
+        # board have many more moves than others.
+        num_chunks = min(len(work), self.num_workers * 4) or 1
+        if budget.max_expansions is not None:
+            budget = _SearchBudget(
+                budget.deadline, -(-budget.max_expansions // num_chunks))
+        cross_check_tables = context.cross_checks.tables()
+        subproblems = [
+            self._executor.submit(
+                _search_in_worker,
+                player_options,
+                rack_letters,
+                context.board,
+                cross_check_tables,
+                work[i::num_chunks],
+                budget,
+                k,
+            )
+            for i in range(num_chunks)
+        ]
+        return [subproblem.result() for subproblem in subproblems]
 
-        return (best_score, best_move)
+    def search_racks(
+        self,
+        player_options: dict,
+        racks: Sequence[Sequence[str]],
+        context: ScrabbleContext,
+        budget: _SearchBudget,
+        k: int,
+    ) -> List[SearchResult]:
+        """Split `racks` between the workers, each searching whole racks."""
+        num_chunks = min(len(racks), self.num_workers * 4) or 1
+        cross_check_tables = context.cross_checks.tables()
+        chunks = [
+            self._executor.submit(
+                _search_racks_in_worker,
+                player_options,
+                racks[i::num_chunks],
+                context.board,
+                cross_check_tables,
+                budget,
+                k,
+            )
+            for i in range(num_chunks)
+        ]
+        results: List[Optional[SearchResult]] = [None] * len(racks)
+        for i, chunk in enumerate(chunks):
+            results[i::num_chunks] = chunk.result()
+        return results
 
 
 class ComputerPlayer(AbstractPlayer):
@@ -107,10 +316,55 @@ class ComputerPlayer(AbstractPlayer):
         priority_strategy: str = "total_score",
         pruner_strategy: str = "never",
         ranker_strategy: str = "max_score",
-        print_all_valid_states=False
+        print_all_valid_states=False,
+        engine: str = "graph",
+        num_workers: int = 1,
+        line_cache_size: int = C.LINE_CACHE_SIZE,
+        trace: Optional[MoveTraceWriter] = None,
     ):
+        """Creates a computer player.
+
+        Args:
+          engine: How to generate moves. "graph" searches forwards from every
+            empty square, ordered by `priority_strategy` and pruned by
+            `pruner_strategy`. "gaddag" generates every move from the anchor
+            squares with the dictionary's GADDAG (see `gaddag_search`).
+          num_workers: If more than 1, split each search between this many
+            processes. Call `close` to stop them.
+          line_cache_size: How many lines the "gaddag" engine remembers the
+            moves of, for the same rack, across searches (see `LineCache`).
+            0 disables the cache.
+          trace: If set, every search and the candidate moves it considers
+            are appended to it, to be rendered offline (see `move_trace`).
+            This is much cheaper than `print_all_valid_states`. Candidates
+            are recorded as they are found, so this needs `num_workers` 1.
+        """
         super().__init__(name, rack_letters)
+        if engine not in ("graph", "gaddag"):
+            raise ValueError(f"Unknown solver engine: {engine}")
+        if trace is not None and num_workers > 1:
+            raise ValueError("A trace can only be recorded with 1 worker.")
         self.print_all_valid_states = print_all_valid_states
+        self._trace = trace
+        self._engine = engine
+        self._num_workers = min(num_workers, C.MAX_NUM_WORKERS)
+        self._pool: Optional[_SearchPool] = None
+        self._line_cache = (
+            LineCache(line_cache_size) if line_cache_size > 0 else None)
+        self._constraints_cache = ConstraintsCache(C.CONSTRAINTS_CACHE_SIZE)
+        # Used to create the same player in worker processes.
+        self._options = dict(
+            priority_strategy=priority_strategy,
+            pruner_strategy=pruner_strategy,
+            ranker_strategy=ranker_strategy,
+            print_all_valid_states=print_all_valid_states,
+            engine=engine,
+            # Workers only live for one search, so their caches would be
+            # thrown away.
+            line_cache_size=0,
+        )
+        # The work done by the last call to `choose_next_move`.
+        self.search_stats = SearchStats()
         self._priority = priority_calculators.PriorityCalculator.create_from_option(
             priority_strategy, context
         )
@@ -120,148 +374,559 @@ class ComputerPlayer(AbstractPlayer):
         self._ranker = ranking_strategies.RankingStrategy.create_from_option(
             ranker_strategy)
 
-    def choose_next_move(self, context: ScrabbleContext) -> Move:
-        return self._calculate_next_move_graph(context)
+    def choose_next_move(
+        self,
+        context: ScrabbleContext,
+        deadline: Optional[float] = None,
+        max_expansions: Optional[int] = None,
+    ) -> Move:
+        return self.search_next_move(context, deadline, max_expansions).move
 
-    def _get_start_states_old(self) -> Sequence[State]:
-        start_states = []
-        constraint_map = defaultdict(lambda: None)
-        for coord in self._context.board:
-            constraints = AffixConstraints.get_constraints_at_point(
-                self._context.board, self._context.dictionary, coord
-            )
-            if constraints is not None:
-                constraint_map[coord] = constraints
-                state = State(
-                    self._context.player_letters,
-                    Move([]),
-                    coord,
-                    constraints,
-                    direction=None,
-                )
-                start_states.append(state)
-        # Needed during state updating in graph search.
-        self._context.solver_constraint_map = constraint_map
+    def search_next_move(
+        self,
+        context: ScrabbleContext,
+        deadline: Optional[float] = None,
+        max_expansions: Optional[int] = None,
+        rack_letters: Optional[Sequence[str]] = None,
+    ) -> SearchResult:
+        """Search for the best move, stopping early if the budget runs out.
 
-        # TODO: Add special case for when the board is empty / first move.
-        print("Start points:")
-        print([state.point for state in start_states])
-        return start_states
+        Args:
+          deadline: A `time.monotonic()` timestamp after which to stop.
+          max_expansions: The maximum number of states to expand.
+          rack_letters: The letters to play, instead of the player's rack.
 
-    def _get_start_states(self, context: ScrabbleContext) -> Sequence[State]:
-        start_states = []
-        for coord in context.board:
-            for direction in [Direction.RIGHT, Direction.DOWN]:
-                if context.board.can_place_tile_at(coord) and _can_reach_placed_tiles(coord, direction, self._rack_letters, context.board):
-                    constraints = AffixConstraints.get_constraints_at_point(
-                        context.board, context.dictionary, coord
-                    )
-                    constraints = constraints or AffixConstraints(
-                        {}, context.dictionary
-                    )
+        Returns:
+          The best move found so far. The graph search explores the most
+          promising states first, so moves found early are good ones.
+        """
+        return self.search_top_moves(
+            context, 1, deadline, max_expansions, rack_letters)
 
-                    state = State(
-                        self._rack_letters,
-                        Move([]),
-                        coord,
-                        constraints,
-                        direction=direction,
-                        touches_tile=context.board.point_touches_tiles(coord)
-                    )
-                    start_states.append(state)
+    def search_top_moves(
+        self,
+        context: ScrabbleContext,
+        k: int,
+        deadline: Optional[float] = None,
+        max_expansions: Optional[int] = None,
+        rack_letters: Optional[Sequence[str]] = None,
+    ) -> SearchResult:
+        """Search for the `k` best moves according to the ranker.
+
+        The moves are kept in a heap of size `k`. Once it is full, the graph
+        search prunes states against the k-th best move rather than the best
+        one, so only states that can't make it into the top `k` are skipped.
+        On an empty board, the words the rack can make are looked up in the
+        dictionary instead (see `_iter_opening_moves`).
 
-        return start_states
+        Args:
+          k: The number of moves to return, if there are that many.
+          deadline: A `time.monotonic()` timestamp after which to stop.
+          max_expansions: The maximum number of states to expand.
+          rack_letters: The letters to play, instead of the player's rack.
+
+        Raises:
+          ValueError: If the rack holds something other than letters and
+            blank tiles, which can't be played yet.
+        """
+        self.search_stats = SearchStats()
+        budget = _SearchBudget(deadline, max_expansions)
+        rack_letters = self._get_rack_letters(rack_letters)
+        if self._trace is not None:
+            self._trace.start_search(context.board, rack_letters)
+        if context.board.is_empty():
+            top_states = self._search_opening(context, rack_letters, k)
+            return SearchResult(top_states, True, self.search_stats)
+        if self._engine == "gaddag":
+            work = gaddag_search.all_lines(context.board)
+        else:
+            work = self._get_start_points(context, rack_letters)
 
-    def _calculate_next_move_graph(self, context: ScrabbleContext) -> Move:
-        start_states = self._get_start_states(context)
-        best_state = self._graph_search(start_states, context)
-        if best_state is None:
-            # TODO: Figure out which letters to exchange.
-            return Move([], MoveType.EXCHANGE)
+        if self._num_workers > 1:
+            top_states, is_complete = self._search_in_parallel(
+                context, rack_letters, work, budget, k)
         else:
-            return best_state.move
+            top_states, is_complete = self._search_part(
+                context, rack_letters, work, budget, k)
+        return SearchResult(top_states, is_complete, self.search_stats)
 
-    def _calculate_next_move_rowcol(self) -> Move:
-        """Calculate the optimal move M(B) by calculating the best move from all the rows and columns.
+    def search_racks(
+        self,
+        context: ScrabbleContext,
+        racks: Sequence[Sequence[str]],
+        k: int = 1,
+        deadline: Optional[float] = None,
+        max_expansions: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """Search for the `k` best moves for each of `racks` on one board.
+
+        What only depends on the board is computed once for all the racks:
+        the cross-checks and anchors, then the start states of the graph
+        search (their constraints and the tiles behind them) or the GADDAG
+        engine's lines (their squares, multipliers and cross-checks). Racks
+        with the same letters are only searched once. If `num_workers` is
+        more than 1, the racks are split between the worker processes.
+
+        The GADDAG engine's line cache isn't used, since it would fill up with
+        moves for racks that are unlikely to come up again.
+
+        Args:
+          racks: The racks to search for, each a sequence of letters.
+          k: The number of moves to return for each rack.
+          deadline: A `time.monotonic()` timestamp after which to stop. Racks
+            that weren't searched by then have no moves.
+          max_expansions: The maximum number of states to expand per rack.
 
-        The best move overall will be a sequence of tiles played across a row or
-        column: ``` M(B) = argmax{ argmax M(B[:, j]), argmax M(B[i, :]) } ```
+        Returns:
+          A result for each rack, in order. `search_stats` holds the total.
+        """
+        budget = _SearchBudget(deadline, max_expansions)
+        rack_letters = [self._get_rack_letters(rack) for rack in racks]
+        # The order of the letters doesn't matter to the search.
+        keys = [tuple(sorted(letters)) for letters in rack_letters]
+        distinct_racks = list(dict.fromkeys(keys))
+        if self._num_workers > 1 and len(distinct_racks) > 1:
+            self._start_pool(context)
+            results = self._pool.search_racks(
+                self._options, distinct_racks, context, budget, k)
+            for result in results:
+                for state in result.top_states:
+                    state._context = context
+        else:
+            results = self._search_racks_here(
+                context, distinct_racks, budget, k)
+
+        self.search_stats = SearchStats()
+        for result in results:
+            self.search_stats.add(result.stats)
+        results_by_key = dict(zip(distinct_racks, results))
+        return [results_by_key[key] for key in keys]
+
+    def iter_moves(
+        self,
+        context: ScrabbleContext,
+        rack_letters: Optional[Sequence[str]] = None,
+        deadline: Optional[float] = None,
+        max_expansions: Optional[int] = None,
+    ) -> Iterator[Tuple[Move, int]]:
+        """Yield every valid move and its total score, as the search finds it.
+
+        Moves are neither ranked nor pruned, and each one is yielded once. The
+        caller may stop iterating at any time. Only the search's own
+        bookkeeping is held in memory, not the moves already yielded (the
+        graph search does remember which states it has queued). This always
+        searches in this process, whatever `num_workers` is.
+
+        Args:
+          rack_letters: The letters to play, instead of the player's rack.
+          deadline: A `time.monotonic()` timestamp after which to stop.
+          max_expansions: The maximum number of states to expand.
+        """
+        self.search_stats = SearchStats()
+        budget = _SearchBudget(deadline, max_expansions)
+        rack_letters = self._get_rack_letters(rack_letters)
+        if context.board.is_empty():
+            candidates = self._iter_opening_moves(context, rack_letters)
+        elif self._engine == "gaddag":
+            candidates = self._gaddag_generator(context).generate_along(
+                rack_letters, gaddag_search.prepare_lines(context),
+                self._should_stop(budget))
+        else:
+            start_states = self._get_start_states(
+                context, rack_letters,
+                self._get_start_points(context, rack_letters))
+            candidates = self._iter_graph_search(start_states, context, budget)
+
+        for candidate in candidates:
+            self.search_stats.moves_found += 1
+            yield candidate.move, candidate.total_score
+
+    def close(self):
+        """Stop the worker processes, if any."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_rack_letters(
+        self, rack_letters: Optional[Sequence[str]]
+    ) -> List[str]:
+        if rack_letters is None:
+            rack_letters = self._rack_letters
+        letters = []
+        for letter in map(str.lower, rack_letters):
+            # TODO: Play blank tiles. Until then, they are kept on the rack.
+            if letter == C.BLANK_TILE:
+                continue
+            if letter not in ALPHABET:
+                raise ValueError(f"Not a letter: {letter!r}")
+            letters.append(letter)
+        return letters
+
+    def _search_part(
+        self,
+        context: ScrabbleContext,
+        rack_letters: Sequence[str],
+        work: Sequence[Any],
+        budget: _SearchBudget,
+        k: int = 1,
+    ) -> Tuple[List[TerminalState], bool]:
+        """Search from the given start points or (for a GADDAG) lines."""
+        if self._engine == "gaddag":
+            return self._search_gaddag(
+                context, rack_letters,
+                gaddag_search.prepare_lines(context, work), budget, k)
+        self._pruner.prepare(context)
+        start_states = self._get_start_states(context, rack_letters, work)
+        return self._graph_search(start_states, context, budget, k)
+
+    def _search_in_parallel(
+        self,
+        context: ScrabbleContext,
+        rack_letters: Sequence[str],
+        work: Sequence[Any],
+        budget: _SearchBudget,
+        k: int,
+    ) -> Tuple[List[TerminalState], bool]:
+        self._start_pool(context)
+        top_states = _TopStates(self._ranker, k)
+        # The graph search can reach a move from start points in different
+        # parts, so the same move can be among the best of several parts.
+        seen = _TranspositionTable(self.search_stats)
+        is_complete = True
+        for part_top_states, is_part_complete, stats in self._pool.search(
+                self._options, rack_letters, context, work, budget, k):
+            is_complete = is_complete and is_part_complete
+            self.search_stats.add(stats)
+            for state in part_top_states:
+                if seen.is_new_move(state):
+                    state._context = context
+                    top_states.add(state)
+        return top_states.best_first(), is_complete
+
+    def _start_pool(self, context: ScrabbleContext) -> None:
+        """Start the worker processes for the context's dictionary, if needed."""
+        if self._pool is None or self._pool.dictionary is not context.dictionary:
+            self.close()
+            self._pool = _SearchPool(context.dictionary, self._num_workers)
+
+    def _search_racks_here(
+        self,
+        context: ScrabbleContext,
+        racks: Sequence[Sequence[str]],
+        budget: _SearchBudget,
+        k: int,
+    ) -> List[SearchResult]:
+        """Search for each rack in turn, in this process. See `search_racks`."""
+        # Openings are looked up rather than searched (see `_search_opening`).
+        is_opening = context.board.is_empty()
+        if not is_opening and self._engine == "gaddag":
+            lines = gaddag_search.prepare_lines(context)
+        elif not is_opening:
+            self._pruner.prepare(context)
+            # The start states of the longest rack, with their distance to
+            # the anchor they lead to: shorter racks only use the closer ones.
+            max_length = max((len(rack) for rack in racks), default=0)
+            start_points = self._get_start_points_by_distance(
+                context, max_length)
+            start_states = list(zip(
+                self._get_start_states(
+                    context, [], [point for point, _ in start_points]),
+                (distance for _, distance in start_points),
+            ))
+
+        results = []
+        for rack_letters in racks:
+            if self._trace is not None:
+                self._trace.start_search(context.board, rack_letters)
+            self.search_stats = SearchStats()
+            rack_budget = _SearchBudget(budget.deadline, budget.max_expansions)
+            if is_opening:
+                top_states = self._search_opening(context, rack_letters, k)
+                is_complete = True
+            elif self._engine == "gaddag":
+                top_states, is_complete = self._search_gaddag(
+                    context, rack_letters, lines, rack_budget, k,
+                    use_line_cache=False)
+            else:
+                rack = R.encode(rack_letters)
+                top_states, is_complete = self._graph_search(
+                    [
+                        state.with_rack(rack)
+                        for state, distance in start_states
+                        if distance < len(rack_letters)
+                    ],
+                    context,
+                    rack_budget,
+                    k,
+                )
+            results.append(
+                SearchResult(top_states, is_complete, self.search_stats))
+        return results
+
+    def _get_start_points(
+        self, context: ScrabbleContext, rack_letters: Sequence[str]
+    ) -> List[Tuple[Point, Direction]]:
+        """The squares and directions to start a move from.
+
+        A move has to cover an anchor (see `ScrabbleContext.anchors`) with one
+        of its first `len(rack_letters)` tiles, so it starts on an anchor or on
+        one of the empty squares just before it.
         """
-        worker_pool = _ScrabbleWorkerPool(self.context)
-        async_subproblems = [
-            *[
-                worker_pool.best_row_move_async(j)
-                for j in range(self.context.board.height)
-            ],
-            *[
-                worker_pool.best_column_move_async(i)
-                for i in range(self.context.board.width)
-            ],
+        return [
+            start_point
+            for start_point, _ in self._get_start_points_by_distance(
+                context, len(rack_letters))
         ]
-        worker_pool.shutdown()
 
-        get_score: Callable[[Tuple[Score, Move]], Score] = lambda tup: tup[0]
-        best_score, best_move = max(
-            [sp.result() for sp in async_subproblems], key=get_score
-        )
-        return best_move
+    def _get_start_points_by_distance(
+        self, context: ScrabbleContext, max_length: int
+    ) -> List[Tuple[Tuple[Point, Direction], int]]:
+        """The start points for racks of up to `max_length` letters.
+
+        Each comes with its distance to the anchor that it leads to, so a rack
+        of `n` letters can start from those at a distance of less than `n`.
+        """
+        board = context.board
+        squares = board.squares
+        anchors = context.anchors
+        distances = {}
+        for direction in [Direction.RIGHT, Direction.DOWN]:
+            backward = squares.neighbors[direction.inverse()]
+            for anchor in anchors:
+                i = anchor
+                for distance in range(max_length):
+                    distances[i, direction] = distance
+                    i = backward[i]
+                    # The squares before another anchor are found from it.
+                    if (i == OFF_BOARD or board.has_tile_at_index(i)
+                            or i in anchors):
+                        break
+
+        # In board order, across before down.
+        return [
+            ((squares.points[i], direction), distance)
+            for (i, direction), distance in sorted(
+                distances.items(),
+                key=lambda item: (item[0][0], item[0][1].is_vertical()))
+        ]
+
+    def _get_start_states(
+        self,
+        context: ScrabbleContext,
+        rack_letters: Sequence[str],
+        start_points: Sequence[Tuple[Point, Direction]],
+    ) -> Sequence[State]:
+        rack = R.encode(rack_letters)
+        cache = self._constraints_cache
+        hits, misses = cache.hits, cache.misses
+        start_states = []
+        for coord, direction in start_points:
+            constraints = AffixConstraints.get_constraints_at_point(
+                context.board, context.dictionary, coord, cache
+            )
+            constraints = constraints or AffixConstraints(
+                {}, context.dictionary
+            )
+
+            state = State.create_start_state(
+                rack,
+                coord,
+                constraints,
+                direction,
+                context,
+            )
+            start_states.append(state)
+
+        self.search_stats.constraints_cache_hits += cache.hits - hits
+        self.search_stats.constraints_cache_misses += cache.misses - misses
+        return start_states
+
+    def _search_opening(
+        self,
+        context: ScrabbleContext,
+        rack_letters: Sequence[str],
+        k: int,
+    ) -> List[TerminalState]:
+        top_states = _TopStates(self._ranker, k)
+        for candidate in self._iter_opening_moves(context, rack_letters):
+            self._consider(candidate, top_states, context)
+        return top_states.best_first()
+
+    def _iter_opening_moves(
+        self, context: ScrabbleContext, rack_letters: Sequence[str]
+    ) -> Iterator[TerminalState]:
+        """Yield every valid move on an empty board.
+
+        The first move only has to cover the start square and forms a single
+        word, so there is nothing to search: each word that the rack can make
+        (see `ScrabbleDictionary.words_from_letters`) is scored at every
+        position along the start square's row and column.
+        """
+        board = context.board
+        squares = board.squares
+        start_point = board.start_point
+        start = squares.index(start_point)
+        lines = [
+            (direction, squares.line(direction, index))
+            for direction, index in [(Direction.RIGHT, start_point.y),
+                                     (Direction.DOWN, start_point.x)]
+        ]
+        rack = R.encode(rack_letters)
+        for word in context.dictionary.words_from_letters(rack_letters):
+            # A single tile doesn't form a word.
+            if len(word) < 2:
+                continue
+            rack_left = rack
+            for letter in word:
+                rack_left = R.remove(rack_left, letter)
+            for direction, line in lines:
+                start_pos = line.index(start)
+                for first in range(max(start_pos - len(word) + 1, 0),
+                                   min(start_pos, len(line) - len(word)) + 1):
+                    tiles = None
+                    main_word_score = 0
+                    word_multiplier = 1
+                    for i, letter in zip(line[first:], word):
+                        letter_multiplier, square_word_multiplier = (
+                            board.multipliers_at_index(i))
+                        main_word_score += (
+                            C.TILE_SCORES[letter] * letter_multiplier)
+                        word_multiplier *= square_word_multiplier
+                        tiles = TileChain(
+                            tiles, PlacedTile(letter, squares.points[i]))
+                    yield TerminalState(
+                        rack_left,
+                        tiles,
+                        start_point,
+                        None,
+                        direction,
+                        True,
+                        main_word_score=main_word_score,
+                        main_word_length=len(word),
+                        word_multiplier=word_multiplier,
+                        num_tiles=len(word),
+                        _context=context,
+                    )
+
+    def _search_gaddag(
+        self,
+        context: ScrabbleContext,
+        rack_letters: Sequence[str],
+        lines: Sequence[gaddag_search.Line],
+        budget: _SearchBudget,
+        k: int = 1,
+        use_line_cache: bool = True,
+    ) -> Tuple[List[TerminalState], bool]:
+        top_states = _TopStates(self._ranker, k)
+        generator = self._gaddag_generator(context, use_line_cache)
+        for candidate in generator.generate_along(
+                rack_letters, lines, self._should_stop(budget)):
+            self._consider(candidate, top_states, context)
+
+        return top_states.best_first(), generator.is_complete
+
+    def _gaddag_generator(
+        self, context: ScrabbleContext, use_line_cache: bool = True
+    ) -> GaddagMoveGenerator:
+        return GaddagMoveGenerator(
+            context, self.search_stats,
+            self._line_cache if use_line_cache else None)
+
+    def _should_stop(
+        self, budget: _SearchBudget
+    ) -> Optional[Callable[[], bool]]:
+        """Checks `budget` as the GADDAG engine expands states, if it is set."""
+        if budget.deadline is None and budget.max_expansions is None:
+            return None
+        return lambda: budget.is_exhausted(self.search_stats)
 
     def _graph_search(
-        self, start_states: Sequence[State], context: ScrabbleContext
-    ) -> Optional[TerminalState]:
+        self,
+        start_states: Sequence[State],
+        context: ScrabbleContext,
+        budget: _SearchBudget,
+        k: int = 1,
+    ) -> Tuple[List[TerminalState], bool]:
         """Execute a graph search from a set of given states.
 
         Args:
           start_states: The initial states to start from.
+          budget: When to stop the search early.
+          k: The number of terminal states to keep.
 
         Returns:
-          The best terminal state according to the ranker. This returns None if
-          no terminal states are found.
+          The `k` best terminal states according to the ranker, best first
+          (fewer if fewer are found), and whether every state was explored.
         """
-        queue: Q.PriorityQueue[Tuple[float, State]] = Q.PriorityQueue()
+        top_states = _TopStates(self._ranker, k)
+        for candidate in self._iter_graph_search(
+                start_states, context, budget, top_states.threshold):
+            self._consider(candidate, top_states, context)
+
+        return top_states.best_first(), not budget.exhausted
+
+    def _iter_graph_search(
+        self,
+        start_states: Sequence[State],
+        context: ScrabbleContext,
+        budget: _SearchBudget,
+        get_best_candidate: Optional[
+            Callable[[], Optional[TerminalState]]] = None,
+    ) -> Iterator[TerminalState]:
+        """Yield the distinct terminal states reachable from `start_states`.
+
+        States are explored in order of priority. If `get_best_candidate` is
+        given, states are pruned by comparing them with the move it returns
+        (if any), e.g. the best one so far.
+        """
+        queue: Q.PriorityQueue[_QueueItem] = Q.PriorityQueue()
+        sequence_numbers = itertools.count()
 
         for start_state in start_states:
             item = _QueueItem(
-                -self._priority.calculate_priority(start_state), start_state
+                -self._priority.calculate_priority(start_state),
+                next(sequence_numbers),
+                start_state,
             )
             queue.put(item)
 
-        best_candidate: Optional[TerminalState] = None
+        seen = _TranspositionTable(self.search_stats)
         while not queue.empty():
+            if budget.is_exhausted(self.search_stats):
+                return
             state = queue.get().state
+            # Prune when the state is popped rather than when it is queued, so
+            # that it is compared against the best move found by then.
+            if (get_best_candidate is not None
+                    and self._pruner.should_prune(get_best_candidate(), state)):
+                continue
+            self.search_stats.states_expanded += 1
             terminal_candidates, child_states = state.get_child_states(context)
             for child_state in child_states:
-                if not self._pruner.should_prune(best_candidate, child_state):
-                    item = _QueueItem(
-                        -self._priority.calculate_priority(child_state), child_state
-                    )
-                    queue.put(item)
+                item = _QueueItem(
+                    -self._priority.calculate_priority(child_state),
+                    next(sequence_numbers),
+                    child_state,
+                )
+                queue.put(item)
 
             for candidate in terminal_candidates:
-                move = candidate.move
-                board = context.board.execute_move(move)
-                if self.print_all_valid_states:
-                    print(board.printable_board(move.placed_tiles))
-                if best_candidate is None or self._ranker.is_better_than(candidate, best_candidate):
-                    best_candidate = candidate
-
-        return best_candidate
-
-
-def _can_reach_placed_tiles(point: Point, direction: Direction, player_letters: Sequence[str], board: ScrabbleBoard) -> bool:
-    # Checks whether it's possible to connect with the played tiles,
-    # using the number of tiles available to the player.
-    for i in range(len(player_letters)):
-        if board.point_touches_tiles(point):
-            return True
-        point = point.move(direction)
-
-    return False
+                if seen.is_new_move(candidate):
+                    yield candidate
 
+    def _consider(
+        self,
+        candidate: TerminalState,
+        top_states: _TopStates,
+        context: ScrabbleContext,
+    ) -> None:
+        """Keep a newly found move if it is among the best ones so far."""
+        self.search_stats.moves_found += 1
+        if self._trace is not None:
+            self._trace.record(candidate.move, candidate.total_score)
+        if self.print_all_valid_states:
+            move = candidate.move
+            board = context.board.execute_move(move)
+            print(board.printable_board(move.placed_tiles))
+        top_states.add(candidate)
 
-if __name__ == "__main__":
-    _context = ScrabbleContext(
-        "XXX", ScrabbleBoard(np.zeros((10, 10)).tolist()), []
-    )
-    solver = ComputerPlayer(_context)
-    print(solver.calculate_next_move())
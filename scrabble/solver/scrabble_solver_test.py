@@ -0,0 +1,138 @@
+from os import path
+from typing import List, Tuple
+
+from absl.testing import absltest
+from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.context.scrabble_context import ScrabbleContext
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.solver.scrabble_solver import ComputerPlayer
+from scrabble.solver.scrabble_solver import SearchResult
+from scrabble.util import constants as C
+
+_RACK = "soiwnfp"
+_RACKS = ["soiwnfp", "eeaiiox", "qzjxkaa", "pnwfios", "heat"]
+
+
+def _open_dictionary() -> ScrabbleDictionary:
+  if path.exists(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH):
+    return ScrabbleDictionary.open(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH)
+  return ScrabbleDictionary.open(C.DEFAULT_DICTIONARY_FILEPATH)
+
+
+def _scored_moves(result: SearchResult) -> List[Tuple[int, frozenset]]:
+  return [
+      (state.total_score, frozenset(state.move.placed_tiles))
+      for state in result.top_states
+  ]
+
+
+class ComputerPlayerTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.context = ScrabbleContext(
+        ScrabbleBoard.open(C.DEFAULT_BOARD_FILEPATH), _open_dictionary()
+    )
+
+  def test_gaddag_search_stops_at_max_expansions(self):
+    player = ComputerPlayer(
+        "test", _RACK, self.context, engine="gaddag", line_cache_size=0
+    )
+    result = player.search_top_moves(self.context, 1, max_expansions=50)
+    self.assertFalse(result.is_complete)
+    self.assertBetween(result.stats.states_expanded, 1, 50)
+
+  def test_gaddag_search_without_budget_is_complete(self):
+    player = ComputerPlayer("test", _RACK, self.context, engine="gaddag")
+    result = player.search_top_moves(self.context, 1)
+    self.assertTrue(result.is_complete)
+    self.assertGreater(result.stats.states_expanded, 50)
+
+  def test_blank_tiles_are_kept_on_the_rack(self):
+    for engine in ("graph", "gaddag"):
+      with self.subTest(engine=engine):
+        player = ComputerPlayer("test", _RACK, self.context, engine=engine)
+        expected = player.search_next_move(self.context)
+        result = player.search_next_move(
+            self.context, rack_letters=_RACK + C.BLANK_TILE
+        )
+        self.assertEqual(result.best_state.total_score,
+                         expected.best_state.total_score)
+        with self.assertRaises(ValueError):
+          player.search_next_move(self.context, rack_letters=_RACK + "1")
+
+  def test_top_moves_are_best_first(self):
+    for engine in ("graph", "gaddag"):
+      with self.subTest(engine=engine):
+        player = ComputerPlayer("test", _RACK, self.context, engine=engine)
+        best = player.search_next_move(self.context).best_state
+        result = player.search_top_moves(self.context, 5)
+        scores = [state.total_score for state in result.top_states]
+        self.assertLen(scores, 5)
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(scores[0], best.total_score)
+
+  def test_top_moves_needs_at_least_one_move(self):
+    player = ComputerPlayer("test", _RACK, self.context)
+    with self.assertRaises(ValueError):
+      player.search_top_moves(self.context, 0)
+
+
+
+class SearchRacksTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    board = ScrabbleBoard.open(C.DEFAULT_BOARD_FILEPATH)
+    word_list = ScrabbleContext(
+        board, ScrabbleDictionary.open(C.DEFAULT_DICTIONARY_FILEPATH)
+    )
+    compiled = ScrabbleContext(board, _open_dictionary())
+    # Building a GADDAG from a word list takes a while (in every worker), so
+    # the "gaddag" engine only searches with a compiled lexicon.
+    cls.cases = [
+        ("graph", "word_list", word_list),
+        ("graph", "compiled", compiled),
+        ("gaddag", "compiled", compiled),
+    ]
+
+  def test_search_racks_matches_search_top_moves(self):
+    for engine, name, context in self.cases:
+      with self.subTest(engine=engine, dictionary=name):
+        player = ComputerPlayer("test", _RACK, context, engine=engine)
+        expected = [
+            _scored_moves(
+                player.search_top_moves(context, 3, rack_letters=rack))
+            for rack in _RACKS
+        ]
+        results = player.search_racks(context, _RACKS, 3)
+        self.assertEqual([_scored_moves(r) for r in results], expected)
+
+  def test_parallel_search_matches_serial_search(self):
+    for engine, name, context in self.cases:
+      with self.subTest(engine=engine, dictionary=name):
+        serial = ComputerPlayer("test", _RACK, context, engine=engine)
+        parallel = ComputerPlayer(
+            "test", _RACK, context, engine=engine, num_workers=3
+        )
+        self.addCleanup(parallel.close)
+        self.assertEqual(
+            _scored_moves(parallel.search_top_moves(context, 3)),
+            _scored_moves(serial.search_top_moves(context, 3)),
+        )
+        self.assertEqual(
+            [
+                _scored_moves(r)
+                for r in parallel.search_racks(context, _RACKS, 3)
+            ],
+            [
+                _scored_moves(r)
+                for r in serial.search_racks(context, _RACKS, 3)
+            ],
+        )
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+
+
+@dataclass
+class SearchStats:
+  """Counters describing the work done by a move search."""
+
+  # Partial moves that were extended, e.g. states popped off the queue.
+  states_expanded: int = 0
+  # Valid moves that were considered by the ranker.
+  moves_found: int = 0
+  # Moves that were skipped because an equivalent one had already been found,
+  # e.g. a single tile found both across and down.
+  duplicates_skipped: int = 0
+  # Lines whose moves were found in, or missing from, the GADDAG engine's line
+  # cache.
+  line_cache_hits: int = 0
+  line_cache_misses: int = 0
+  # Start squares whose constraints were found in, or missing from, the
+  # solver's `ConstraintsCache`.
+  constraints_cache_hits: int = 0
+  constraints_cache_misses: int = 0
+
+  def add(self, other: SearchStats) -> None:
+    """Add the counters of `other`, e.g. from another part of a search."""
+    for field in dataclasses.fields(self):
+      setattr(
+          self, field.name, getattr(self, field.name) + getattr(other, field.name)
+      )
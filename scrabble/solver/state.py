@@ -1,104 +1,174 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Callable
+from typing import FrozenSet, List, Optional, Tuple
 
+from scrabble.solver import rack as R
 from scrabble.solver.constraints import AffixConstraints
+from scrabble.context.scrabble_board import OFF_BOARD
 from scrabble.context.scrabble_context import ScrabbleContext
+from scrabble.util import constants as C
 from scrabble.util.scrabble_move import Move
 from scrabble.util.scrabble_util import Direction
 from scrabble.util.scrabble_util import PlacedTile
 from scrabble.util.scrabble_util import Point
+from scrabble.util.scrabble_util import letter_bit
+from scrabble.util.scrabble_util import mask_to_letters
+
+
+class TileChain:
+  """The tiles placed by a partial move, as a persistent linked list.
+
+  Each link holds the last tile placed and points to the links of the tiles
+  placed before it, which are shared with the parent state. Placing a tile is
+  then O(1), and a `Move` is only built when one is asked for.
+  """
+
+  __slots__ = ("parent", "tile")
+
+  def __init__(self, parent: Optional[TileChain], tile: PlacedTile):
+    self.parent = parent
+    self.tile = tile
+
+  def tiles(self) -> List[PlacedTile]:
+    """The tiles, in the order they were placed."""
+    tiles = []
+    link = self
+    while link is not None:
+      tiles.append(link.tile)
+      link = link.parent
+    tiles.reverse()
+    return tiles
 
 
-@dataclass
 class State:
   """A state represents the context around an empty square and the move it is a part of.
   """
 
-  letters_left: List[str]
-  move: Move
-  point: Point  # may not need point?
-  constraints: AffixConstraints
-  direction: Optional[Direction]
-  touches_tile: bool
+  __slots__ = (
+      "rack",
+      "tiles",
+      "point",
+      "constraints",
+      "direction",
+      "touches_tile",
+      "main_word_score",
+      "main_word_length",
+      "word_multiplier",
+      "cross_word_score",
+      "num_tiles",
+  )
 
-  def get_child_states_old(
-      self, context: ScrabbleContext
-  ) -> Tuple[List[TerminalState], List[State]]:
-    terminal_states = []
-    child_states = []
-    # TODO: !!! fix! and can't explore two directions like
-    #    X
-    # ABCX
-    #    X
-    # Maybe get min and max of tiles based on MoveType, then explore in both directions.
-
-    # If a direction is set, explore in that one. Otherwise explore in all
-    # directions.
-    directions = (
-        [self.direction]
-        if self.direction
-        else [Direction.RIGHT, Direction.DOWN]
+  def __init__(
+      self,
+      rack: int,
+      tiles: Optional[TileChain],
+      point: Point,
+      constraints: Optional[AffixConstraints],
+      direction: Optional[Direction],
+      touches_tile: bool,
+      main_word_score: int = 0,
+      main_word_length: int = 0,
+      word_multiplier: int = 1,
+      cross_word_score: int = 0,
+      num_tiles: int = 0,
+  ):
+    # The letters left to play, encoded by `rack.encode`.
+    self.rack = rack
+    # The tiles placed so far, or None.
+    self.tiles = tiles
+    self.point = point
+    self.constraints = constraints
+    self.direction = direction
+    self.touches_tile = touches_tile
+    # Running totals for scoring the move, updated as each letter is appended:
+    # - the letter scores of the word along `direction` (before its word
+    #   multiplier), and the number of tiles in it,
+    # - the product of the word multipliers under the placed tiles,
+    # - the total score of the perpendicular words formed so far.
+    self.main_word_score = main_word_score
+    self.main_word_length = main_word_length
+    self.word_multiplier = word_multiplier
+    self.cross_word_score = cross_word_score
+    self.num_tiles = num_tiles
+
+  def __repr__(self) -> str:
+    return (
+        f"{type(self).__name__}(move={self.move}, point={self.point},"
+        f" direction={self.direction})"
     )
-    for direction in directions:  # Assume direction in [RIGHT, DOWN].
-      for letter in self.letters_left:
-        (
-            is_valid_submove,
-            is_valid_move,
-        ) = self.constraints.check_constraints(letter, direction)
-        if is_valid_submove:
-          placed_tiles = [
-              *self.move.placed_tiles,
-              PlacedTile(letter, self.point),
-          ]
-          move = Move(placed_tiles)
-          #print(f"{move} is a valid submove for direction {direction.name}")
-          #print(f"(According to {self.constraints} at {self.point})")
-          new_board = context.board.execute_move(move)
-
-          inverse = direction.inverse()
-          min_point = min(
-              placed_tiles,
-              key=_get_directional_coord(direction),
-          ).location
-          max_point = max(
-              placed_tiles,
-              key=_get_directional_coord(inverse),
-          ).location
-
-          # Explore by either adding to the end of the move or the beginning.
-          for next_point in [
-              min_point.move(inverse),
-              max_point.move(direction),
-          ]:
-            if not context.board.can_place_tile_at(next_point):
-              continue
-
-            # Build the new state after putting down this letter.
-
-            #print("Old constraints:", self.constraints)
-            # TODO: Update constraints instead of generating from scratch.
-            #print(f"trying to get constraints at {next_point} with {move}")
-            constraints = AffixConstraints.get_constraints_at_point(
-                new_board, context.dictionary, next_point
-            )
-            # constraints = self.constraints.update(
-            #    next_point, direction, context
-            # )
-
-            print("Constraints for", next_point, constraints)
-            letters_left = self.letters_left.copy()
-            letters_left.remove(letter)  # Remove first occurence.
-            state = State(
-                letters_left, move, next_point, constraints, direction
-            )
-            child_states.append(state)
-            if is_valid_move:
-              terminal_state = TerminalState.create_from_state(state, context)
-              terminal_states.append(terminal_state)
 
-    return terminal_states, child_states
+  @property
+  def move(self) -> Move:
+    """The tiles placed so far, as a new `Move`."""
+    return Move(self.tiles.tiles() if self.tiles is not None else [])
+
+  def move_key(self) -> FrozenSet[PlacedTile]:
+    """`self.move.key()`, without building the move."""
+    return frozenset(self.tiles.tiles() if self.tiles is not None else ())
+
+  @property
+  def letters_left(self) -> List[str]:
+    return R.decode(self.rack)
+
+  def with_rack(self, rack: int) -> State:
+    """A copy of this state with another rack, e.g. to reuse a start state."""
+    return State(
+        rack,
+        self.tiles,
+        self.point,
+        self.constraints,
+        self.direction,
+        self.touches_tile,
+        self.main_word_score,
+        self.main_word_length,
+        self.word_multiplier,
+        self.cross_word_score,
+        self.num_tiles,
+    )
+
+  @staticmethod
+  def create_start_state(
+      rack: int,
+      point: Point,
+      constraints: AffixConstraints,
+      direction: Direction,
+      context: ScrabbleContext,
+  ) -> State:
+    """The state for a move starting at `point` along `direction`."""
+    # Tiles just behind the start square are part of the main word.
+    board = context.board
+    backward = board.squares.neighbors[direction.inverse()]
+    main_word_score = 0
+    main_word_length = 0
+    behind = backward[board.squares.index(point)]
+    while behind != OFF_BOARD and board.has_tile_at_index(behind):
+      main_word_score += C.TILE_SCORES[board.letter_at_index(behind)]
+      main_word_length += 1
+      behind = backward[behind]
+
+    return State(
+        rack,
+        None,
+        point,
+        constraints,
+        direction,
+        touches_tile=board.point_touches_tiles(point),
+        main_word_score=main_word_score,
+        main_word_length=main_word_length,
+    )
+
+  @property
+  def total_score(self) -> int:
+    """The score of `move`, as `ScrabbleContext.score_move` would compute it."""
+    if not self.num_tiles:
+      return 0
+    total = self.cross_word_score
+    # A single tile only forms a main word if it extends one on the board.
+    if self.main_word_length > 1:
+      total += self.main_word_score * self.word_multiplier
+    if self.num_tiles == C.TILES_DRAWN_PER_PLAYER:
+      total += C.BINGO_BONUS
+    return total
 
   def get_child_states(
       self, context: ScrabbleContext
@@ -106,48 +176,55 @@ class State:
     # Explore in one direction.
     terminal_states = []
     child_states = []
-    # If a direction is set, explore in that one. Otherwise explore in all
-    # directions.
-    for letter in self.letters_left:
-      (
-          is_valid_submove,
-          is_valid_move,
-      ) = self.constraints.check_constraints(letter, self.direction)
-      if is_valid_submove:
-        placed_tiles = [
-            *self.move.placed_tiles,
-            PlacedTile(letter, self.point),
-        ]
-        move = Move(placed_tiles)
-        new_point = self.point.move(self.direction)
-        if not context.board.can_place_tile_at(new_point):
-          continue
-
-        # Build the new state after putting down this letter.
-        # TODO: Update constraints instead of generating from scratch.
-        new_board = context.board.execute_move(move)
-        constraints = AffixConstraints.get_constraints_at_point(
-            new_board, context.dictionary, new_point
-        )
-        if constraints is None:
-          continue
-        touches_tile = self.touches_tile or context.board.point_touches_tiles(
-            new_point
-        )
-        letters_left = self.letters_left.copy()
-        letters_left.remove(letter)  # Remove first occurence.
-        state = State(
-            letters_left,
-            move,
-            new_point,
-            constraints,
-            self.direction,
-            touches_tile,
-        )
+    submove_mask, move_mask = self.constraints.get_letter_masks(self.direction)
+    # The letters on the rack that can be played here, each tried once however
+    # many copies of it there are.
+    allowed_mask = submove_mask & R.letter_mask(self.rack)
+    if not allowed_mask:
+      return terminal_states, child_states
+
+    # Letters are only placed where the move can continue.
+    board = context.board
+    i = board.squares.index(self.point)
+    next_i = board.squares.neighbors[self.direction][i]
+    if next_i == OFF_BOARD or board.has_tile_at_index(next_i):
+      return terminal_states, child_states
+    new_point = board.squares.points[next_i]
+    touches_tile = self.touches_tile or board.touches_tiles_at_index(next_i)
+    letter_multiplier, word_multiplier = board.multipliers_at_index(i)
+    cross_score = context.cross_checks.get_score_at_index(i, self.direction)
+    for letter in mask_to_letters(allowed_mask):
+      is_valid_move = move_mask & letter_bit(letter)
+      # Build the new state after putting down this letter.
+      constraints = self.constraints.update(
+          letter, new_point, self.direction, context
+      )
+      if constraints is None:
+        continue
+      letter_score = C.TILE_SCORES[letter] * letter_multiplier
+      cross_word_score = self.cross_word_score
+      if cross_score is not None:
+        cross_word_score += (cross_score + letter_score) * word_multiplier
+      rack = R.remove(self.rack, letter)
+      state = State(
+          rack,
+          TileChain(self.tiles, PlacedTile(letter, self.point)),
+          new_point,
+          constraints,
+          self.direction,
+          touches_tile,
+          self.main_word_score + letter_score,
+          self.main_word_length + 1,
+          self.word_multiplier * word_multiplier,
+          cross_word_score,
+          self.num_tiles + 1,
+      )
+      # Only explore further if the rack can still make a longer word.
+      if constraints.can_extend(self.direction, rack):
         child_states.append(state)
-        if is_valid_move and self.touches_tile:
-          terminal_state = TerminalState.create_from_state(state, context)
-          terminal_states.append(terminal_state)
+      if is_valid_move and self.touches_tile:
+        terminal_state = TerminalState.create_from_state(state, context)
+        terminal_states.append(terminal_state)
 
     return terminal_states, child_states
 
@@ -155,36 +232,55 @@ class State:
 Score = dict
 
 
-def _get_directional_coord(
-    direction: Direction,
-) -> Callable[[PlacedTile], float]:
-  def _inner(tile: PlacedTile) -> float:
-    if direction in (Direction.RIGHT, Direction.LEFT):
-      return tile.location.x
-    else:
-      return tile.location.y
+class TerminalState(State):
+  """A state whose move is valid, i.e. a candidate move."""
+
+  __slots__ = ("_context", "_move", "_score")
 
-  return _inner
+  def __init__(
+      self,
+      *args,
+      _context: Optional[ScrabbleContext] = None,
+      **kwargs,
+  ):
+    super().__init__(*args, **kwargs)
+    self._context = _context
+    self._move: Optional[Move] = None
+    self._score: Optional[Score] = None
 
-_DEFAULT_SCORE = {
-    "total_score": 0
-} 
+  @property
+  def move(self) -> Move:
+    """The move, built the first time it is asked for."""
+    if self._move is None:
+      self._move = super().move
+    return self._move
 
-@dataclass
-class TerminalState(State):
-  score: Score = field(default_factory=lambda: _DEFAULT_SCORE)
+  @property
+  def score(self) -> Score:
+    """The breakdown of the move's score, as returned by `score_move`.
+
+    This re-reads every word formed by the move, so it is only computed when
+    asked for. Use `total_score` to compare moves.
+    """
+    if self._score is None:
+      self._score = self._context.score_move(self.move)
+    return self._score
 
   @staticmethod
   def create_from_state(
       state: State, context: ScrabbleContext
   ) -> TerminalState:
-    score = context.score_move(state.move)
     return TerminalState(
-        state.letters_left,
-        state.move,
+        state.rack,
+        state.tiles,
         state.point,
         state.constraints,
         state.direction,
         False,
-        score
+        state.main_word_score,
+        state.main_word_length,
+        state.word_multiplier,
+        state.cross_word_score,
+        state.num_tiles,
+        _context=context,
     )
@@ -79,10 +79,21 @@ BINGO_BONUS = 50
 
 MAX_NUM_WORKERS = 32
 
+# The number of lines whose moves the GADDAG engine remembers across turns.
+LINE_CACHE_SIZE = 4096
+
+# The number of affix constraints that a solver remembers across searches.
+CONSTRAINTS_CACHE_SIZE = 4096
+
+# The number of gaps between two words whose hooks a dictionary remembers.
+INNER_HOOK_CACHE_SIZE = 4096
+
 # Resources.
 _PACKAGE_NAME = "scrabble"
 RESOURCE_ROOT = resource_filename(_PACKAGE_NAME, "resources")
 DEFAULT_DICTIONARY_FILEPATH = path.join(RESOURCE_ROOT, "word_list.txt")
+# Built from the word list by `compile_dictionary_main`.
+DEFAULT_COMPILED_DICTIONARY_FILEPATH = path.join(RESOURCE_ROOT, "word_list.lex")
 DEFAULT_BOARD_FILEPATH = path.join(RESOURCE_ROOT, "board_1.txt")
 
 
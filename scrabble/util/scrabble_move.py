@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 from scrabble.util import constants as C
 from scrabble.util.scrabble_util import PlacedTile
@@ -25,6 +25,14 @@ class Move:
   def is_bingo(self) -> bool:
     return len(self.placed_tiles) == C.TILES_DRAWN_PER_PLAYER
 
+  def key(self) -> FrozenSet[PlacedTile]:
+    """A canonical key for the move: the same tiles on the same squares.
+
+    Moves with the same key put the same board in play and score the same,
+    regardless of the order the tiles were placed in.
+    """
+    return frozenset(self.placed_tiles)
+
   def __str__(self) -> str:
     return (
         "{"
@@ -2,6 +2,39 @@ from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum
 import math
+from typing import Iterable, Iterator, Tuple
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+"""Letters are identified by their index in the alphabet in letter masks."""
+
+ALL_LETTERS_MASK = (1 << len(ALPHABET)) - 1
+
+# `int.bit_count` was only added in Python 3.10.
+popcount = getattr(int, "bit_count", None) or (lambda n: bin(n).count("1"))
+
+
+def letter_code(letter: str) -> int:
+  return ord(letter) - 97
+
+
+def letter_bit(letter: str) -> int:
+  return 1 << (ord(letter) - 97)
+
+
+def letters_to_mask(letters: Iterable[str]) -> int:
+  """A bitmask with bit `letter_code(c)` set for every letter c."""
+  mask = 0
+  for letter in letters:
+    mask |= 1 << (ord(letter) - 97)
+  return mask
+
+
+def mask_to_letters(mask: int) -> Iterator[str]:
+  """The letters whose bits are set in `mask`, in alphabetical order."""
+  while mask:
+    low_bit = mask & -mask
+    yield ALPHABET[low_bit.bit_length() - 1]
+    mask ^= low_bit
 
 
 @dataclass(eq=True, frozen=True)
@@ -17,14 +50,12 @@ class Direction(Enum):
   RIGHT = 3
 
   def inverse(self) -> Direction:
-    if self == Direction.UP:
-      return Direction.DOWN
-    elif self == Direction.DOWN:
-      return Direction.UP
-    elif self == Direction.LEFT:
-      return Direction.RIGHT
-    else:
-      return Direction.LEFT
+    return _INVERSES[self]
+
+  @property
+  def delta(self) -> Tuple[int, int]:
+    """The (x, y) offset of the next square in this direction."""
+    return _DELTAS[self]
 
   def is_horizontal(self) -> bool:
     return self in (Direction.LEFT, Direction.RIGHT)
@@ -33,20 +64,29 @@ class Direction(Enum):
     return not self.is_horizontal()
 
 
+_INVERSES = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
+
+_DELTAS = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0),
+}
+
+
 @dataclass(eq=True, frozen=True)
 class Point:
   x: int
   y: int
 
   def move(self, direction: Direction) -> Point:
-    if direction == Direction.UP:
-      return Point(self.x, self.y - 1)
-    elif direction == Direction.DOWN:
-      return Point(self.x, self.y + 1)
-    elif direction == Direction.LEFT:
-      return Point(self.x - 1, self.y)
-    else:
-      return Point(self.x + 1, self.y)
+    dx, dy = _DELTAS[direction]
+    return Point(self.x + dx, self.y + dy)
 
   def distance(self, other: Point) -> float:
     return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2)
@@ -1,3 +1,5 @@
+from os import path
+
 from absl import app
 from absl import flags
 from scrabble.context.scrabble_board import ScrabbleBoard
@@ -12,8 +14,13 @@ from scrabble.scrabble_game import ScrabbleGame
 
 _DICTIONARY_FILEPATH = flags.DEFINE_string(
     "dict_filepath",
-    C.DEFAULT_DICTIONARY_FILEPATH,
-    "A path to a .txt file containing a word per line.",
+    C.DEFAULT_COMPILED_DICTIONARY_FILEPATH
+    if path.exists(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH)
+    else C.DEFAULT_DICTIONARY_FILEPATH,
+    (
+        "A path to a .txt file containing a word per line, or to a lexicon"
+        " compiled from one by `compile_dictionary_main`."
+    ),
 )
 
 _BOARD_FILEPATH = flags.DEFINE_string(
@@ -0,0 +1,127 @@
+"""Compares the solver engines on a board and a set of racks.
+
+For each rack, engine and number of worker processes, reports the number of
+states expanded, the number of valid moves considered, the number of duplicate
+states and moves skipped, the wall time and the score of the chosen move.
+"""
+
+import time
+from os import path
+
+from absl import app
+from absl import flags
+from scrabble.context.scrabble_board import ScrabbleBoard
+from scrabble.context.scrabble_context import ScrabbleContext
+from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.solver.scrabble_solver import ComputerPlayer
+from scrabble.util import constants as C
+
+
+_DICTIONARY_FILEPATH = flags.DEFINE_string(
+    "dict_filepath",
+    C.DEFAULT_COMPILED_DICTIONARY_FILEPATH
+    if path.exists(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH)
+    else C.DEFAULT_DICTIONARY_FILEPATH,
+    (
+        "A path to a .txt file containing a word per line, or to a lexicon"
+        " compiled from one by `compile_dictionary_main`."
+    ),
+)
+
+_BOARD_FILEPATH = flags.DEFINE_string(
+    "board_filepath",
+    C.DEFAULT_BOARD_FILEPATH,
+    "A path to a .txt file containing the board as a grid.",
+)
+
+_RACKS = flags.DEFINE_list(
+    "racks",
+    ["soiwnfp", "heat", "eeaiiox", "qzjxkaa", "sarevtu", "exduqcr"],
+    "The racks to solve for.",
+)
+
+_ENGINES = flags.DEFINE_list(
+    "engines", ["graph", "gaddag"], "The solver engines to compare."
+)
+
+_PRUNING_STRATEGY = flags.DEFINE_string(
+    "pruning_strategy",
+    "never",
+    "How the graph engine chooses when to prune a state.",
+)
+
+_NUM_WORKERS = flags.DEFINE_list(
+    "num_workers",
+    ["1"],
+    "The numbers of worker processes to run each engine with, e.g. 1,2,4,8.",
+)
+
+
+def main(argv):
+  del argv
+  dictionary = ScrabbleDictionary.open(_DICTIONARY_FILEPATH.value)
+  context = ScrabbleContext(
+      ScrabbleBoard.open(_BOARD_FILEPATH.value), dictionary
+  )
+  # Build the lazily computed tables up front so that no engine pays for them.
+  context.cross_checks
+  dictionary.gaddag
+  dictionary.anagram_index
+
+  configs = [
+      (engine, int(num_workers))
+      for engine in _ENGINES.value
+      for num_workers in _NUM_WORKERS.value
+  ]
+  players = {}
+  for engine, num_workers in configs:
+    players[engine, num_workers] = ComputerPlayer(
+        "benchmark",
+        "",
+        context,
+        pruner_strategy=_PRUNING_STRATEGY.value,
+        engine=engine,
+        num_workers=num_workers,
+        # Measure the searches themselves; see `line_cache_benchmark_main`.
+        line_cache_size=0,
+    )
+    # Start the worker processes before timing anything.
+    players[engine, num_workers].search_next_move(
+        context, rack_letters=_RACKS.value[0]
+    )
+
+  print(
+      f"{'rack':>10}{'engine':>10}{'workers':>9}{'states':>12}{'moves':>10}"
+      f"{'duplicates':>12}{'time (s)':>12}{'score':>8}"
+  )
+  totals = {config: [0, 0, 0, 0.0] for config in configs}
+  for rack in _RACKS.value:
+    for engine, num_workers in configs:
+      player = players[engine, num_workers]
+      start = time.perf_counter()
+      result = player.search_next_move(context, rack_letters=rack)
+      elapsed = time.perf_counter() - start
+      score = context.score_move(result.move)["total_score"]
+      stats = result.stats
+      print(
+          f"{rack:>10}{engine:>10}{num_workers:>9}{stats.states_expanded:>12}"
+          f"{stats.moves_found:>10}{stats.duplicates_skipped:>12}"
+          f"{elapsed:>12.3f}{score:>8}"
+      )
+      totals[engine, num_workers][0] += stats.states_expanded
+      totals[engine, num_workers][1] += stats.moves_found
+      totals[engine, num_workers][2] += stats.duplicates_skipped
+      totals[engine, num_workers][3] += elapsed
+
+  for (engine, num_workers), config_totals in totals.items():
+    states, moves, duplicates, elapsed = config_totals
+    print(
+        f"{'total':>10}{engine:>10}{num_workers:>9}{states:>12}{moves:>10}"
+        f"{duplicates:>12}{elapsed:>12.3f}"
+    )
+  for player in players.values():
+    player.close()
+
+
+if __name__ == "__main__":
+  app.run(main)
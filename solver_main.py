@@ -1,8 +1,12 @@
+import time
+from os import path
+
 from absl import app
 from absl import flags
 from scrabble.context.scrabble_board import ScrabbleBoard
 from scrabble.context.scrabble_context import ScrabbleContext
 from scrabble.context.scrabble_dictionary import ScrabbleDictionary
+from scrabble.solver.move_trace import MoveTraceWriter
 from scrabble.solver.scrabble_solver import ComputerPlayer
 from scrabble.util import constants as C
 from scrabble.util.scrabble_move import Move
@@ -10,8 +14,13 @@ from scrabble.util.scrabble_move import Move
 
 _DICTIONARY_FILEPATH = flags.DEFINE_string(
     "dict_filepath",
-    C.DEFAULT_DICTIONARY_FILEPATH,
-    "A path to a .txt file containing a word per line.",
+    C.DEFAULT_COMPILED_DICTIONARY_FILEPATH
+    if path.exists(C.DEFAULT_COMPILED_DICTIONARY_FILEPATH)
+    else C.DEFAULT_DICTIONARY_FILEPATH,
+    (
+        "A path to a .txt file containing a word per line, or to a lexicon"
+        " compiled from one by `compile_dictionary_main`."
+    ),
 )
 
 _BOARD_FILEPATH = flags.DEFINE_string(
@@ -46,12 +55,51 @@ _PRIORITY_CALCULATION = flags.DEFINE_string(
     "How to choose which states to explore first.",
 )
 
+_ENGINE = flags.DEFINE_enum(
+    "engine",
+    "graph",
+    ["graph", "gaddag"],
+    "How to generate moves: graph search or a GADDAG.",
+)
+
+_TIME_LIMIT_SECS = flags.DEFINE_float(
+    "time_limit_secs",
+    None,
+    "If set, return the best move found within this many seconds.",
+)
+
+_MAX_EXPANSIONS = flags.DEFINE_integer(
+    "max_expansions",
+    None,
+    "If set, return the best move found after expanding this many states.",
+)
+
+_NUM_WORKERS = flags.DEFINE_integer(
+    "num_workers", 1, "How many processes to split the search between."
+)
+
+_NUM_HINTS = flags.DEFINE_integer(
+    "num_hints", 0, "If set, also list this many of the best moves."
+)
+
+_TRACE_FILEPATH = flags.DEFINE_string(
+    "trace_filepath",
+    None,
+    (
+        "If set, append the candidate moves considered to this file, to be"
+        " rendered by `render_trace_main`. Needs --num_workers=1."
+    ),
+)
+
 
 def main(argv):
   del argv
   board = ScrabbleBoard.open(_BOARD_FILEPATH.value)
   dictionary = ScrabbleDictionary.open(_DICTIONARY_FILEPATH.value)
   context = ScrabbleContext(board, dictionary)
+  trace = None
+  if _TRACE_FILEPATH.value:
+    trace = MoveTraceWriter.open(_TRACE_FILEPATH.value)
   solver = ComputerPlayer(
       "scrabble-bot",
       _CURRENT_LETTERS.value,
@@ -59,9 +107,24 @@ def main(argv):
       _PRIORITY_CALCULATION.value,
       _PRUNING_STRATEGY.value,
       _RANKING_STRATEGY.value,
+      engine=_ENGINE.value,
+      num_workers=_NUM_WORKERS.value,
+      trace=trace,
   )
   print("I'm thinking...")
-  move: Move = solver.choose_next_move(context)
+  deadline = None
+  if _TIME_LIMIT_SECS.value is not None:
+    deadline = time.monotonic() + _TIME_LIMIT_SECS.value
+  # The hints come from the same search as the move.
+  result = solver.search_top_moves(
+      context, max(1, _NUM_HINTS.value), deadline, _MAX_EXPANSIONS.value
+  )
+  move: Move = result.move
+  if not result.is_complete:
+    print(
+        f"Out of time after {result.stats.states_expanded} states; this is the"
+        " best move found so far."
+    )
   score_dict = context.score_move(move, check_valid=True)
   print("Here's the move you should do:")
   print(move)
@@ -69,6 +132,14 @@ def main(argv):
   print("Score for this move:")
   print(score_dict)
 
+  if _NUM_HINTS.value:
+    print(f"The {len(result.top_states)} best moves:")
+    for state in result.top_states:
+      print(f"{state.total_score:>5}  {state.move}")
+  solver.close()
+  if trace is not None:
+    trace.close()
+
 
 if __name__ == "__main__":
   app.run(main)